@@ -0,0 +1 @@
+"""Benchmarks of the cor.adt hot paths, see `python -m benchmarks --help`"""
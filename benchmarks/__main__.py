@@ -0,0 +1,94 @@
+'''Run cor.adt benchmarks
+
+    python -m benchmarks run [-k PATTERN] [-o results.json] [--baseline base.json]
+    python -m benchmarks compare base.json results.json [--threshold 0.1]
+
+Exit code is 1 if some benchmark is regressed compared to the baseline.
+
+'''
+import argparse
+import sys
+
+from . import cases  # noqa: F401, registers benchmarks
+from .runner import (
+    compare,
+    format_value,
+    get_benchmarks,
+    get_value,
+    load,
+    run,
+    save,
+)
+
+
+def _report(name, res):
+    print('{:<40} {:>14}'.format(name, format_value(res['kind'], get_value(res))))
+
+
+def _report_comparison(comparisons, threshold):
+    regressions = [c for c in comparisons if c.is_regression]
+    for c in comparisons:
+        print('{:<40} {:>14} {:>14} {:>+8.1%}{}'.format(
+            c.name,
+            format_value(c.kind, c.baseline),
+            format_value(c.kind, c.current),
+            c.change,
+            '  REGRESSION' if c.is_regression else ''
+        ))
+    if regressions:
+        print('{} benchmark(s) regressed by more than {:.0%}'.format(
+            len(regressions), threshold
+        ))
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks', description='cor.adt benchmarks'
+    )
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    run_parser = commands.add_parser('run', help='run benchmarks')
+    run_parser.add_argument(
+        '-k', dest='patterns', action='append', default=[],
+        help='run only benchmarks with names containing the pattern'
+    )
+    run_parser.add_argument('-o', '--output', help='save results to JSON file')
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument(
+        '--min-time', type=float, default=0.2,
+        help='minimal time of one timing run, seconds'
+    )
+    run_parser.add_argument('--baseline', help='compare with saved results')
+    run_parser.add_argument('--threshold', type=float, default=0.1)
+    run_parser.add_argument('--list', action='store_true', help='list benchmarks')
+
+    compare_parser = commands.add_parser('compare', help='compare saved results')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+    if args.command == 'compare':
+        comparisons = compare(load(args.baseline), load(args.current), args.threshold)
+        return _report_comparison(comparisons, args.threshold)
+
+    benchmarks = get_benchmarks(args.patterns)
+    if args.list:
+        for bench in benchmarks:
+            print(bench.name)
+        return 0
+
+    results = run(benchmarks, args.repeat, args.min_time, _report)
+    if args.output:
+        save(args.output, results)
+    if args.baseline:
+        print()
+        comparisons = compare(load(args.baseline), results, args.threshold)
+        return _report_comparison(comparisons, args.threshold)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
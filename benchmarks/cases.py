@@ -0,0 +1,216 @@
+from cor.adt.generate import generate_inputs
+from cor.adt.operation import (
+    adaptive,
+    as_basic_type,
+    choose_by_field,
+    convert,
+    expect_type,
+    should_be,
+    skip_missing,
+    Tag,
+)
+from cor.adt.record import (
+    ExtensibleRecord,
+    Record,
+    record_factory,
+    subrecord,
+)
+
+from .runner import (
+    memory,
+    timing,
+)
+
+
+class Point(Record):
+    x = expect_type(int)
+    y = expect_type(int)
+    name = convert(str)
+    weight = skip_missing >> convert(float)
+    active = skip_missing >> expect_type(bool)
+
+
+_point_input = {'x': 1, 'y': 2, 'name': 'p', 'weight': '1.5', 'active': True}
+
+_wide_size = 50
+Wide = record_factory(
+    'Wide', **{'f{}'.format(i): expect_type(int) for i in range(_wide_size)}
+).record_type
+_wide_input = {'f{}'.format(i): i for i in range(_wide_size)}
+
+
+class Segment(Record):
+    start = subrecord(Point)
+    end = subrecord(Point)
+
+
+class Polyline(Record):
+    first = subrecord(Segment)
+    second = subrecord(Segment)
+
+
+_segment_input = {'start': _point_input, 'end': _point_input}
+_polyline_input = {'first': _segment_input, 'second': _segment_input}
+
+
+class Extensible(ExtensibleRecord):
+    id = expect_type(int)
+
+
+_extra_count = 100
+_extensible_input = dict(
+    {'extra{}'.format(i): i for i in range(_extra_count)}, id=1
+)
+
+
+@timing('construct.flat')
+def _():
+    return lambda: Point(_point_input)
+
+
+@timing('construct.wide{}'.format(_wide_size))
+def _():
+    return lambda: Wide(_wide_input)
+
+
+@timing('construct.nested')
+def _():
+    return lambda: Polyline(_polyline_input)
+
+
+@timing('construct.extensible{}'.format(_extra_count))
+def _():
+    return lambda: Extensible(_extensible_input)
+
+
+def _add_pipe_benchmark(length):
+    @timing('pipe.length{}'.format(length))
+    def _():
+        op = expect_type(int)
+        for _ in range(length - 1):
+            op = op >> convert(int)
+
+        cls = record_factory('Pipe{}'.format(length), value=op).record_type
+        values = {'value': 1}
+        return lambda: cls(values)
+
+
+for _length in (1, 4, 16):
+    _add_pipe_benchmark(_length)
+
+
+class Kind(Tag):
+    First = 'first'
+    Last = 'last'
+
+
+class FirstVariant(Record):
+    kind = should_be(Kind.First)
+    value = expect_type(int)
+
+
+class LastVariant(Record):
+    kind = should_be(Kind.Last)
+    value = expect_type(int)
+
+
+_union = (
+    expect_type(str) | expect_type(float) | subrecord(FirstVariant)
+    | subrecord(LastVariant)
+)
+
+
+def _add_or_benchmark(name, op, value):
+    @timing(name)
+    def _():
+        cls = record_factory('Union', value=op).record_type
+        values = {'value': value}
+        return lambda: cls(values)
+
+
+_add_or_benchmark('or.early', _union, 'text')
+_add_or_benchmark('or.late', _union, {'kind': Kind.Last, 'value': 1})
+_add_or_benchmark('or.late.adaptive', adaptive(_union), {'kind': Kind.Last, 'value': 1})
+
+_variant_count = 50
+VariantKind = Tag('VariantKind', [
+    ('V{}'.format(i), 'v{}'.format(i)) for i in range(_variant_count)
+])
+_variants = [
+    record_factory(
+        'Variant{}'.format(i),
+        kind=convert(VariantKind) >> should_be(VariantKind['V{}'.format(i)]),
+        value=expect_type(int),
+    )
+    for i in range(_variant_count)
+]
+
+
+@timing('choose_by_field.variants{}'.format(_variant_count))
+def _():
+    cls = record_factory(
+        'Choice', value=choose_by_field('kind', _variants)
+    ).record_type
+    values = {'value': {'kind': 'v{}'.format(_variant_count - 1), 'value': 1}}
+    return lambda: cls(values)
+
+
+@timing('stream.generated1000')
+def _():
+    rows = list(generate_inputs(Polyline, 1000, seed=0))
+    factory = Polyline.get_factory()
+    return lambda: list(factory.stream(rows, on_error='skip'))
+
+
+@timing('as_basic_type.flat')
+def _():
+    record = Point(_point_input)
+    return lambda: as_basic_type(record)
+
+
+@timing('as_basic_type.nested')
+def _():
+    record = Polyline(_polyline_input)
+    return lambda: as_basic_type(record)
+
+
+@timing('eq.flat')
+def _():
+    left, right = Point(_point_input), Point(_point_input)
+    return lambda: left == right
+
+
+@timing('eq.nested')
+def _():
+    left, right = Polyline(_polyline_input), Polyline(_polyline_input)
+    return lambda: left == right
+
+
+@timing('record_factory')
+def _():
+    fields = {
+        'x': expect_type(int),
+        'name': skip_missing >> convert(str),
+        'point': subrecord(Point),
+    }
+    return lambda: record_factory('Dynamic', **fields)
+
+
+@memory('memory.flat')
+def _():
+    return lambda: Point(_point_input)
+
+
+@memory('memory.wide{}'.format(_wide_size))
+def _():
+    return lambda: Wide(_wide_input)
+
+
+@memory('memory.nested')
+def _():
+    return lambda: Polyline(_polyline_input)
+
+
+@memory('memory.extensible{}'.format(_extra_count))
+def _():
+    return lambda: Extensible(_extensible_input)
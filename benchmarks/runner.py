@@ -0,0 +1,150 @@
+import collections
+import datetime
+import gc
+import json
+import platform
+import statistics
+import sys
+import timeit
+import tracemalloc
+
+
+Benchmark = collections.namedtuple('Benchmark', 'name kind setup')
+
+_benchmarks = collections.OrderedDict()
+
+
+def _register(kind, name):
+    def decorator(setup):
+        if name in _benchmarks:
+            raise ValueError('Benchmark is already registered: {}'.format(name))
+        _benchmarks[name] = Benchmark(name, kind, setup)
+        return setup
+
+    return decorator
+
+
+def timing(name):
+    '''register timing benchmark
+
+    Decorated function is called once to prepare data and should return the
+    callable w/o arguments to be timed.
+
+    '''
+    return _register('time', name)
+
+
+def memory(name):
+    '''register memory benchmark
+
+    Decorated function is called once to prepare data and should return the
+    callable w/o arguments creating one instance to be measured.
+
+    '''
+    return _register('memory', name)
+
+
+def get_benchmarks(patterns=()):
+    return [
+        bench for name, bench in _benchmarks.items()
+        if not patterns or any(p in name for p in patterns)
+    ]
+
+
+def measure_time(fn, repeat=5, min_time=0.2):
+    '''get per-call times of the best and median of `repeat` runs'''
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(number, int(number * min_time / max(elapsed, 1e-9)))
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        'best': min(times),
+        'median': statistics.median(times),
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def measure_memory(create, count=10000):
+    '''get average size of allocations done to create one instance'''
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        instances = [create() for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    size = after - before - sys.getsizeof(instances)
+    del instances
+    return {'bytes_per_instance': size / count, 'count': count}
+
+
+def run(benchmarks, repeat=5, min_time=0.2, report=None):
+    results = collections.OrderedDict()
+    for bench in benchmarks:
+        fn = bench.setup()
+        if bench.kind == 'time':
+            res = measure_time(fn, repeat, min_time)
+        else:
+            res = measure_memory(fn)
+        res['kind'] = bench.kind
+        results[bench.name] = res
+        if report:
+            report(bench.name, res)
+    return {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'results': results,
+    }
+
+
+def get_value(res):
+    return res['best'] if res['kind'] == 'time' else res['bytes_per_instance']
+
+
+Comparison = collections.namedtuple(
+    'Comparison', 'name kind baseline current change is_regression'
+)
+
+
+def compare(baseline, current, threshold=0.1):
+    '''compare results of benchmarks present in both runs
+
+    Change is the relative change of the current value (best time or memory
+    per instance), benchmark is regressed if it exceeds `threshold`.
+
+    '''
+    res = []
+    baseline_results = baseline['results']
+    for name, current_res in current['results'].items():
+        baseline_res = baseline_results.get(name)
+        if baseline_res is None or baseline_res['kind'] != current_res['kind']:
+            continue
+        old, new = get_value(baseline_res), get_value(current_res)
+        change = (new - old) / old if old else 0.0
+        res.append(Comparison(
+            name, current_res['kind'], old, new, change, change > threshold
+        ))
+    return res
+
+
+def format_value(kind, value):
+    if kind == 'memory':
+        return '{:.1f} B'.format(value)
+    for unit, scale in (('s', 1), ('ms', 1e3), ('us', 1e6)):
+        if value * scale >= 1:
+            return '{:.3f} {}'.format(value * scale, unit)
+    return '{:.1f} ns'.format(value * 1e9)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
@@ -0,0 +1,245 @@
+import array
+import collections
+import sys
+
+from .error import (
+    FieldError,
+    InvalidFieldError,
+    RecordError,
+)
+from .hook import Target
+from .operation import (
+    as_basic_type,
+    get_result_type,
+)
+from .record import Record
+
+
+_array_typecodes = {
+    int: 'q',
+    float: 'd',
+}
+
+_numpy_dtypes = {
+    int: 'int64',
+    float: 'float64',
+}
+
+
+def _pack_column(column, result_type, use_numpy):
+    '''store column of numeric values compactly if all values have exact type'''
+    if result_type not in _array_typecodes:
+        return column
+    if set(map(type, column)) != {result_type}:
+        return column
+
+    try:
+        if use_numpy:
+            import numpy
+            return numpy.array(column, dtype=_numpy_dtypes[result_type])
+        return array.array(_array_typecodes[result_type], column)
+    except OverflowError:
+        return column
+
+
+def _is_numpy_array(column):
+    numpy = sys.modules.get('numpy')
+    return numpy is not None and isinstance(column, numpy.ndarray)
+
+
+def _get_item_getter(column):
+    '''get function reading column value by index as python object
+
+    Indexing numpy array returns numpy scalar, so `ndarray.item` is used.
+
+    '''
+    return column.item if _is_numpy_array(column) else column.__getitem__
+
+
+def _get_values(column):
+    return column.tolist() if _is_numpy_array(column) else column
+
+
+class RowView(collections.Mapping):
+    '''Lightweight read-only view of the RecordBatch row'''
+
+    __slots__ = ('_batch', '_index')
+
+    def __init__(self, batch, index):
+        self._batch = batch
+        self._index = index
+
+    def __getattr__(self, name):
+        try:
+            get_item = self._batch._getters[name]
+        except KeyError as err:
+            raise AttributeError(name) from err
+        return get_item(self._index)
+
+    def __getitem__(self, name):
+        return self._batch._getters[name](self._index)
+
+    def __iter__(self):
+        return iter(self._batch._columns)
+
+    def __len__(self):
+        return len(self._batch._columns)
+
+    @property
+    def index(self):
+        return self._index
+
+    def to_record(self):
+        return self._batch.record_type._from_state(
+            tuple(get_item(self._index) for get_item in self._batch._getters.values())
+        )
+
+    def __repr__(self):
+        return '{}[{}]({})'.format(
+            self._batch.record_type.__name__, self._index, dict(self.items())
+        )
+
+
+@as_basic_type.register(RowView)
+def row_view_as_basic_type(v):
+    return {k: as_basic_type(x) for k, x in v.items()}
+
+
+def _prepare_column(record_type, name, prepare, rows):
+    column = []
+    add = column.append
+    try:
+        try:
+            for values in rows:
+                add(prepare(name, values))
+        except FieldError:
+            raise
+        except Exception as err:
+            raise InvalidFieldError(name, 'input') from err
+    except Exception as err:
+        raise RecordError(record_type.__name__, "init", row=len(column)) from err
+    return column
+
+
+def _run_hooks(record_type, columns, size):
+    init_hooks = getattr(record_type, Target.Init.value, [])
+    post_init_hooks = getattr(record_type, Target.PostInit.value, [])
+    if not (init_hooks or post_init_hooks):
+        return
+
+    batch = RecordBatch(record_type, columns, size)
+    for i in range(size):
+        row = RowView(batch, i)
+        try:
+            for hook in init_hooks:
+                res = hook(row)
+                if res:
+                    name, value = res
+                    columns[name][i] = value
+        except Exception as err:
+            raise RecordError(record_type.__name__, "init", row=i) from err
+
+        try:
+            for hook in post_init_hooks:
+                hook(row)
+        except Exception as err:
+            raise RecordError(record_type.__name__, "post-init", row=i) from err
+
+
+class RecordBatch(collections.Sequence):
+    '''Columnar storage for many records of the same Record type
+
+    Each field is stored in the separate column: list or, for numeric fields
+    with all values of the exact field type, `array.array` (or numpy array if
+    requested).
+
+    '''
+
+    def __init__(self, record_type, columns: collections.Mapping, size: int):
+        self._record_type = record_type
+        self._columns = columns
+        self._getters = {
+            name: _get_item_getter(column) for name, column in columns.items()
+        }
+        self._size = size
+
+    @classmethod
+    def from_rows(cls, record_type, rows, use_numpy=False):
+        '''validate input mappings column by column using record contract'''
+        if not (issubclass(record_type, Record)
+                and record_type._initialize is Record._initialize):
+            raise TypeError(
+                'Only records w/o custom initialization can be stored in batch'
+            )
+
+        rows = rows if isinstance(rows, collections.Sequence) else list(rows)
+        columns = {
+            name: _prepare_column(record_type, name, prepare, rows)
+            for name, prepare in record_type._preparers.items()
+        }
+
+        _run_hooks(record_type, columns, len(rows))
+
+        for name, column in columns.items():
+            result_type = get_result_type(record_type._fields[name])
+            columns[name] = _pack_column(column, result_type, use_numpy)
+
+        return cls(record_type, columns, len(rows))
+
+    @classmethod
+    def from_records(cls, record_type, records, use_numpy=False):
+        '''store already validated records'''
+        if not issubclass(record_type, Record):
+            raise TypeError('Only records w/o extra fields can be stored in batch')
+
+        records = (
+            records if isinstance(records, collections.Sequence)
+            else list(records)
+        )
+        names = record_type._fields
+        states = (
+            zip(*map(record_type._get_state, records)) if records
+            else ([] for _ in names)
+        )
+        columns = {
+            name: _pack_column(
+                list(column), get_result_type(names[name]), use_numpy
+            )
+            for name, column in zip(names, states)
+        }
+        return cls(record_type, columns, len(records))
+
+    @property
+    def record_type(self):
+        return self._record_type
+
+    def column(self, name):
+        return self._columns[name]
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            columns = {k: v[index] for k, v in self._columns.items()}
+            return self.__class__(
+                self._record_type, columns, len(range(*index.indices(self._size)))
+            )
+
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        return RowView(self, index)
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield RowView(self, i)
+
+    def iter_states(self):
+        '''iterate over tuples of row field values'''
+        return zip(*map(_get_values, self._columns.values()))
+
+    def to_records(self):
+        from_state = self._record_type._from_state
+        return [from_state(state) for state in self.iter_states()]
@@ -0,0 +1,305 @@
+import struct
+
+from .error import DecodeError
+from .operation import (
+    get_result_type,
+    get_tag_indexes,
+    Tag,
+)
+from .record import (
+    ExtensibleRecord,
+    find_record_type,
+    RecordBase,
+)
+
+
+_MAGIC = b'\xad\x01'
+_FINGERPRINT_SIZE = 8
+_HEADER_SIZE = len(_MAGIC) + _FINGERPRINT_SIZE
+
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3
+_FLOAT = 4
+_STR = 5
+_BYTES = 6
+_LIST = 7
+_TUPLE = 8
+_DICT = 9
+_FIELD_TAG = 10
+_FIELD_RECORD = 11
+_RECORD = 12
+
+_float = struct.Struct('<d')
+
+
+def _write_varint(out, n):
+    while n > 0x7f:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(data, pos):
+    res = 0
+    shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        res |= (b & 0x7f) << shift
+        if b < 0x80:
+            return res, pos
+        shift += 7
+
+
+def _write_str(out, v):
+    encoded = v.encode('utf-8')
+    _write_varint(out, len(encoded))
+    out += encoded
+
+
+def _read_str(data, pos):
+    size, pos = _read_varint(data, pos)
+    end = pos + size
+    return str(data[pos:end], 'utf-8'), end
+
+
+def _get_fingerprint_bytes(record_type):
+    return bytes.fromhex(record_type._schema_fingerprint)
+
+
+def _encode_int(out, v):
+    out.append(_INT)
+    _write_varint(out, v << 1 if v >= 0 else ((-v) << 1) - 1)
+
+
+def _encode_float(out, v):
+    out.append(_FLOAT)
+    out += _float.pack(v)
+
+
+def _encode_str(out, v):
+    out.append(_STR)
+    _write_str(out, v)
+
+
+def _encode_bytes(out, v):
+    out.append(_BYTES)
+    _write_varint(out, len(v))
+    out += v
+
+
+def _encode_sequence(code):
+    def encode(out, v):
+        out.append(code)
+        _write_varint(out, len(v))
+        for item in v:
+            _encode_value(out, item)
+
+    return encode
+
+
+def _encode_dict(out, v):
+    out.append(_DICT)
+    _write_varint(out, len(v))
+    for k, item in v.items():
+        _encode_value(out, k)
+        _encode_value(out, item)
+
+
+_value_encoders = {
+    type(None): lambda out, v: out.append(_NONE),
+    bool: lambda out, v: out.append(_TRUE if v else _FALSE),
+    int: _encode_int,
+    float: _encode_float,
+    str: _encode_str,
+    bytes: _encode_bytes,
+    list: _encode_sequence(_LIST),
+    tuple: _encode_sequence(_TUPLE),
+    dict: _encode_dict,
+}
+
+
+def _encode_value(out, v):
+    try:
+        encode = _value_encoders[v.__class__]
+    except KeyError:
+        if isinstance(v, Tag):
+            raise TypeError(
+                "Can't encode Tag value of the field w/o Tag result type: {!r}".format(v)
+            )
+        if not isinstance(v, RecordBase):
+            raise TypeError("Can't encode value of type {}".format(type(v)))
+        out.append(_RECORD)
+        out += _get_fingerprint_bytes(v.__class__)
+        _encode_body(out, v)
+    else:
+        encode(out, v)
+
+
+def _get_field_types(record_type):
+    '''get tuple of Tag or record result types (or None) of the fields'''
+    res = vars(record_type).get('_codec_field_types')
+    if res is None:
+        res = tuple(
+            t if isinstance(t, type) and issubclass(t, (Tag, RecordBase)) else None
+            for t in map(get_result_type, record_type._fields.values())
+        )
+        record_type._codec_field_types = res
+    return res
+
+
+def _encode_body(out, record):
+    record_type = record.__class__
+    state = record_type._get_state(record)
+    for field_type, v in zip(_get_field_types(record_type), state):
+        if field_type is not None and v.__class__ is field_type:
+            if issubclass(field_type, Tag):
+                out.append(_FIELD_TAG)
+                _write_varint(out, get_tag_indexes(field_type)[0][v])
+            else:
+                out.append(_FIELD_RECORD)
+                _encode_body(out, v)
+        else:
+            _encode_value(out, v)
+
+    if isinstance(record, ExtensibleRecord):
+        extra = record.__dict__
+        _write_varint(out, len(extra))
+        for k, v in extra.items():
+            _write_str(out, k)
+            _encode_value(out, v)
+
+
+def encode(record: RecordBase) -> bytes:
+    '''encode record into compact binary form
+
+    Payload starts with the record class schema fingerprint followed by the
+    field values in the order of fields declaration. Field names are not
+    stored, Tag and subrecord values of the field contract result type are
+    stored as the member index and inline record respectively.
+
+    Supported field values are None, bool, int, float, str, bytes, records
+    and lists, tuples and dicts of them. Tag values are supported only in the
+    fields with Tag result type (e.g. `convert(SomeTag)`), as there is no
+    safe way to find the Tag class decoding other values.
+
+    '''
+    out = bytearray(_MAGIC)
+    out += _get_fingerprint_bytes(record.__class__)
+    _encode_body(out, record)
+    return bytes(out)
+
+
+def _decode_sequence(data, pos, trusted):
+    size, pos = _read_varint(data, pos)
+    res = []
+    for _ in range(size):
+        v, pos = _decode_value(data, pos, None, trusted)
+        res.append(v)
+    return res, pos
+
+
+def _decode_value(data, pos, field_type, trusted):
+    code = data[pos]
+    pos += 1
+    if code == _NONE:
+        return None, pos
+    if code == _FALSE:
+        return False, pos
+    if code == _TRUE:
+        return True, pos
+    if code == _INT:
+        v, pos = _read_varint(data, pos)
+        return (-((v + 1) >> 1) if v & 1 else v >> 1), pos
+    if code == _FLOAT:
+        return _float.unpack_from(data, pos)[0], pos + _float.size
+    if code == _STR:
+        return _read_str(data, pos)
+    if code == _BYTES:
+        size, pos = _read_varint(data, pos)
+        return bytes(data[pos:pos + size]), pos + size
+    if code == _LIST:
+        return _decode_sequence(data, pos, trusted)
+    if code == _TUPLE:
+        res, pos = _decode_sequence(data, pos, trusted)
+        return tuple(res), pos
+    if code == _DICT:
+        size, pos = _read_varint(data, pos)
+        res = {}
+        for _ in range(size):
+            k, pos = _decode_value(data, pos, None, trusted)
+            res[k], pos = _decode_value(data, pos, None, trusted)
+        return res, pos
+    if code == _FIELD_TAG and field_type is not None:
+        i, pos = _read_varint(data, pos)
+        return get_tag_indexes(field_type)[1][i], pos
+    if code == _FIELD_RECORD and field_type is not None:
+        return _decode_body(data, pos, field_type, trusted)
+    if code == _RECORD:
+        end = pos + _FINGERPRINT_SIZE
+        record_type = find_record_type(bytes(data[pos:end]).hex())
+        return _decode_body(data, end, record_type, trusted)
+    raise ValueError("Unexpected value code {} at {}".format(code, pos - 1))
+
+
+def _decode_body(data, pos, record_type, trusted):
+    state = []
+    for field_type in _get_field_types(record_type):
+        v, pos = _decode_value(data, pos, field_type, trusted)
+        state.append(v)
+
+    extra = None
+    if issubclass(record_type, ExtensibleRecord):
+        size, pos = _read_varint(data, pos)
+        extra = {}
+        for _ in range(size):
+            k, pos = _read_str(data, pos)
+            extra[k], pos = _decode_value(data, pos, None, trusted)
+
+    if trusted:
+        return record_type._from_state(tuple(state), extra), pos
+
+    values = {
+        k: v for k, v in zip(record_type._fields, state) if v is not None
+    }
+    return ({**extra, **values} if extra else values), pos
+
+
+def get_fingerprint(data: bytes) -> str:
+    '''get schema fingerprint of the encoded record w/o decoding it'''
+    if len(data) < _HEADER_SIZE or data[:len(_MAGIC)] != _MAGIC:
+        raise DecodeError('record', 'Not an encoded record')
+    return bytes(data[len(_MAGIC):_HEADER_SIZE]).hex()
+
+
+def decode(data: bytes, record_type=None, trusted=False):
+    '''decode record encoded by `encode()`
+
+    If `record_type` is provided the payload schema fingerprint should match
+    its fingerprint, otherwise the record class is found by the fingerprint.
+
+    Trusted payload fields are set directly w/o validation. Otherwise the
+    record is constructed from the decoded values (subrecords are decoded as
+    mappings) using the regular contract.
+
+    '''
+    fingerprint = get_fingerprint(data)
+    if record_type is None:
+        try:
+            record_type = find_record_type(fingerprint)
+        except LookupError as err:
+            raise DecodeError('record', 'Unknown schema', fingerprint=fingerprint) from err
+    elif fingerprint != record_type._schema_fingerprint:
+        raise DecodeError(
+            record_type.__name__, 'Schema mismatch', fingerprint=fingerprint
+        )
+
+    try:
+        res, pos = _decode_body(memoryview(data), _HEADER_SIZE, record_type, trusted)
+    except (IndexError, LookupError, TypeError, ValueError, struct.error) as err:
+        raise DecodeError(record_type.__name__, 'Malformed payload') from err
+    if pos != len(data):
+        raise DecodeError(record_type.__name__, 'Trailing data', size=len(data) - pos)
+    return res if trusted else record_type(res)
@@ -1,3 +1,6 @@
+import pickle
+
+
 
 def ensure_callable(fn):
     if not callable(fn):
@@ -20,9 +23,78 @@ def ensure_has_type(expected_types, v):
     return v
 
 
+def _restore_error(cls, args, cause=None):
+    err = cls.__new__(cls)
+    err.args = args
+    if cause is not None:
+        err.__cause__ = cause
+    return err
+
+
+def _get_picklable_cause(err):
+    '''get error cause or its description if it can't be pickled'''
+    cause = err.__cause__
+    if cause is None or isinstance(cause, Error):
+        return cause
+    try:
+        pickle.dumps(cause)
+    except Exception:
+        return Exception(repr(cause))
+    return cause
+
+
+class Deferred:
+    '''Value calculated by `fn(*args)` only when it is requested'''
+    __slots__ = ('_fn', '_args')
+
+    def __init__(self, fn, *args):
+        self._fn = fn
+        self._args = args
+
+    def get(self):
+        return self._fn(*self._args)
+
+
 class Error(Exception):
+    '''Base class for ADT errors
+
+    Exception `args` is the tuple with the single dict containing the `name`,
+    `info` and other provided keyword arguments. The dict is created only when
+    `args` are accessed (e.g. exception is printed). The `info` can be
+    `Deferred` to be rendered only at that time too.
+
+    '''
+    _args = None
+
     def __init__(self, name, info, **kwargs):
-        super().__init__({'name': name, 'info': info, **kwargs})
+        self._name = name
+        self._info = info
+        self._kwargs = kwargs
+
+    @property
+    def args(self):
+        if self._args is None:
+            info = self._info
+            if isinstance(info, Deferred):
+                info = info.get()
+            self._args = ({'name': self._name, 'info': info, **self._kwargs},)
+        return self._args
+
+    @args.setter
+    def args(self, value):
+        self._args = tuple(value)
+
+    def __str__(self):
+        return str(self.args[0])
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, self.args[0])
+
+    def __reduce__(self):
+        return (
+            _restore_error,
+            (self.__class__, self.args, _get_picklable_cause(self))
+        )
 
     def wrap(self, name):
         return self._wrap(name, self)
@@ -49,5 +121,71 @@ class InvalidFieldError(Error):
     pass
 
 
+class ErrorLimitError(Error):
+    pass
+
+
+class DecodeError(Error):
+    pass
+
+
+class AggregateError(RecordError):
+    '''Errors of all invalid fields of the record
+
+    `errors` maps field name to the field error or, for the subrecord field,
+    to the nested AggregateError. If there were more errors than allowed the
+    evaluation was stopped and `truncated` is set.
+
+    '''
+    def __init__(self, name, errors, truncated=False, info='invalid fields'):
+        super().__init__(name, info, errors=errors, truncated=truncated)
+
+    @property
+    def errors(self) -> dict:
+        return self.args[0]['errors']
+
+    @property
+    def truncated(self) -> bool:
+        return self.args[0]['truncated']
+
+    def gen_leaf_errors(self, path=()):
+        '''generate (field path tuple, error) pairs of the error tree'''
+        for name, err in self.errors.items():
+            if isinstance(err, AggregateError):
+                yield from err.gen_leaf_errors(path + (name,))
+            else:
+                yield path + (name,), err
+
+
+class Failure:
+    '''Result of the failed operation
+
+    Exception describing the failure is created by `create(*args)` only when
+    it is requested.
+
+    '''
+    __slots__ = ('_create', '_args', '_error')
+
+    def __init__(self, create, *args):
+        self._create = create
+        self._args = args
+        self._error = None
+
+    @classmethod
+    def from_error(cls, err):
+        res = cls(None)
+        res._error = err
+        return res
+
+    @property
+    def error(self) -> Exception:
+        if self._error is None:
+            self._error = self._create(*self._args)
+        return self._error
+
+    def __repr__(self):
+        return 'Failure({!r})'.format(self.error)
+
+
 class AccessError(Exception):
     pass
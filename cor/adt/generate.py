@@ -0,0 +1,391 @@
+'''Generation of the record input mappings from the record contracts
+
+Input values are generated by walking field operation trees: type checks
+(`expect_types`), constants (`should_be`, tags), optional fields
+(`skip_missing`, `provide_missing`), `Or` alternatives, subrecords and
+`choose_by_field` unions are supported. Arbitrary conditions (`only_if`) and
+conversions can't be inverted, so values for pipes are generated by the first
+step and filtered by the whole pipe. Generators for other fields should be
+provided explicitly.
+
+'''
+import functools
+import itertools
+import random
+import string
+import typing
+
+from .operation import (
+    _Anything,
+    _gen_discriminants,
+    _gen_or_alternatives,
+    _gen_pipe_steps,
+    _GenerateMissing,
+    _ProvideMissing,
+    _SkipMissing,
+    _Something,
+    AdaptiveOr,
+    compile_try_operation,
+    Memoized,
+    missing_value,
+    Or,
+    Pipe,
+    SimpleConversion,
+    Tag,
+)
+from .record import (
+    Factory,
+    RecordBase,
+)
+from .error import Failure
+
+
+def _choose_uniformly(alternatives, rng):
+    return int(rng.random() * len(alternatives))
+
+
+class _Context:
+    '''Shared state of the field generators compilation'''
+
+    def __init__(self, rng, choose, optional_ratio, max_depth):
+        self.rng = rng
+        self.choose = choose
+        self.optional_ratio = optional_ratio
+        self.max_depth = max_depth
+        self.depth = 0
+        letters = string.ascii_letters + string.digits
+        self.words = tuple(
+            ''.join(rng.choice(letters) for _ in range(rng.randint(3, 12)))
+            for _ in range(256)
+        )
+
+    def gen_word(self):
+        random = self.rng.random
+        words = self.words
+        size = len(words)
+        return lambda: words[int(random() * size)]
+
+    def gen_choice(self, alternatives, generators):
+        '''choose generator for one of alternatives on each call'''
+        available = [
+            (op, gen) for op, gen in zip(alternatives, generators)
+            if gen is not None
+        ]
+        if not available:
+            return None
+        if len(available) == 1:
+            return available[0][1]
+
+        ops = tuple(op for op, _ in available)
+        gens = tuple(gen for _, gen in available)
+        choose = self.choose
+        rng = self.rng
+        return lambda: gens[choose(ops, rng)]()
+
+
+def _gen_constant(value):
+    return lambda: value
+
+
+def compile_type_generator(value_type: type, context: _Context) -> typing.Optional[typing.Callable]:
+    '''get function generating instances of the type or None if not supported'''
+    if isinstance(value_type, type) and issubclass(value_type, Tag):
+        members = tuple(value_type)
+        random = context.rng.random
+        return lambda: members[int(random() * len(members))]
+    if isinstance(value_type, type) and issubclass(value_type, RecordBase):
+        return None
+
+    random = context.rng.random
+    generators = {
+        int: lambda: int(random() * 2000) - 1000,
+        float: lambda: random() * 2000 - 1000,
+        bool: lambda: random() < 0.5,
+        str: context.gen_word(),
+        type(None): _gen_constant(None),
+    }
+    res = generators.get(value_type)
+    if res is not None:
+        return res
+
+    gen_word = context.gen_word()
+    generators = {
+        bytes: lambda: gen_word().encode('ascii'),
+        list: lambda: [int(random() * 100) for _ in range(int(random() * 4))],
+        tuple: lambda: tuple(int(random() * 100) for _ in range(int(random() * 4))),
+        dict: lambda: {gen_word(): int(random() * 100) for _ in range(int(random() * 4))},
+    }
+    return generators.get(value_type)
+
+
+@functools.singledispatch
+def compile_input_generator(op, context: _Context) -> typing.Optional[typing.Callable]:
+    '''get function generating the field input value accepted by the operation
+
+    Generated value is `missing_value` if the field should be absent. Return
+    None if the input can't be generated for the operation.
+
+    '''
+    return None
+
+
+@compile_input_generator.register(SimpleConversion)
+def _(op, context):
+    if hasattr(op, '_choice'):
+        _, factories = op._choice
+        return context.gen_choice(factories, [
+            compile_input_generator(factory, context) for factory in factories
+        ])
+
+    if hasattr(op, '_expected'):
+        return _gen_constant(op._expected)
+
+    expected_types = getattr(op, '_expected_types', None)
+    if expected_types is not None:
+        return context.gen_choice(expected_types, [
+            compile_type_generator(t, context) for t in expected_types
+        ])
+
+    value_type = op._convert
+    if hasattr(op, '_condition') or not isinstance(value_type, type):
+        return None
+
+    if issubclass(value_type, Tag):
+        values = tuple(member.value for member in value_type)
+        random = context.rng.random
+        return lambda: values[int(random() * len(values))]
+    return compile_type_generator(value_type, context)
+
+
+@compile_input_generator.register(Factory)
+def _(op, context):
+    if context.depth >= context.max_depth:
+        return None
+
+    context.depth += 1
+    try:
+        gen_row = _compile_row_generator(op.record_type, context, {})
+    except TypeError:
+        return None
+    finally:
+        context.depth -= 1
+    return gen_row
+
+
+def _gen_optional(context, gen):
+    random = context.rng.random
+    ratio = context.optional_ratio
+    if gen is None:
+        return lambda: missing_value
+    return lambda: missing_value if random() < ratio else gen()
+
+
+# count of generated values checked to be accepted by the operation
+_max_attempts = 100
+
+
+def _gen_accepted(op, gen):
+    '''filter values of `gen` by the operation
+
+    Return None if no value is accepted in `_max_attempts` ones.
+
+    '''
+    try_prepare = compile_try_operation(op)
+
+    def is_accepted(value):
+        try:
+            return type(try_prepare('value', {'value': value})) is not Failure
+        except Exception:
+            return False
+
+    if not any(is_accepted(gen()) for _ in range(_max_attempts)):
+        return None
+
+    def gen_accepted():
+        for _ in range(_max_attempts):
+            value = gen()
+            if is_accepted(value):
+                return value
+        raise ValueError("Can't generate value accepted by: {}".format(op.info))
+
+    return gen_accepted
+
+
+def _compile_steps(op, steps, context):
+    first, *tail = steps
+    if isinstance(first, (_SkipMissing, _ProvideMissing, _GenerateMissing)):
+        return _gen_optional(context, tail and _compile_steps(op, tail, context) or None)
+    gen = compile_input_generator(first, context)
+    if gen is None or not tail:
+        return gen
+    return _gen_accepted(op, gen)
+
+
+@compile_input_generator.register(Pipe)
+def _(op, context):
+    discriminants = [value for value, _ in _gen_discriminants(op)]
+    if discriminants:
+        random = context.rng.random
+        return lambda: discriminants[int(random() * len(discriminants))]
+    return _compile_steps(op, list(_gen_pipe_steps(op)), context)
+
+
+@compile_input_generator.register(Or)
+@compile_input_generator.register(AdaptiveOr)
+def _(op, context):
+    alternatives = tuple(
+        op._alternatives if isinstance(op, AdaptiveOr) else _gen_or_alternatives(op)
+    )
+    return context.gen_choice(alternatives, [
+        compile_input_generator(alt, context) for alt in alternatives
+    ])
+
+
+@compile_input_generator.register(Memoized)
+def _(op, context):
+    return compile_input_generator(op.operation, context)
+
+
+@compile_input_generator.register(_SkipMissing)
+@compile_input_generator.register(_ProvideMissing)
+@compile_input_generator.register(_GenerateMissing)
+def _(op, context):
+    return _gen_optional(context, None)
+
+
+@compile_input_generator.register(_Something)
+def _(op, context):
+    return context.gen_word()
+
+
+@compile_input_generator.register(_Anything)
+def _(op, context):
+    return _gen_optional(context, context.gen_word())
+
+
+def _compile_row_generator(record_type, context, field_generators):
+    generators = []
+    for name, op in record_type._fields.items():
+        gen = field_generators.get(name)
+        if gen is None:
+            gen = compile_input_generator(op, context)
+        if gen is None:
+            raise TypeError(
+                "Can't generate input for {}.{}: {}".format(
+                    record_type.__name__, name, op.info
+                )
+            )
+        generators.append((name, gen))
+
+    def gen_row():
+        row = {}
+        for name, gen in generators:
+            value = gen()
+            if value is not missing_value:
+                row[name] = value
+        return row
+
+    return gen_row
+
+
+_invalid_candidates = (missing_value, None, '', 'invalid', -1, 1.5, True, [], {})
+
+
+def _get_invalid_values(record_type, name):
+    '''get candidate values rejected by the field contract'''
+    try_prepare = record_type._try_preparers[name]
+    res = []
+    for value in _invalid_candidates:
+        values = {} if value is missing_value else {name: value}
+        try:
+            is_invalid = type(try_prepare(name, values)) is Failure
+        except Exception:
+            is_invalid = True
+        if is_invalid:
+            res.append(value)
+    return res
+
+
+class InputGenerator:
+    '''Reproducible stream of the record input mappings
+
+    Generator yields valid inputs and, with `invalid_ratio` probability,
+    inputs with one field missing or replaced by the value rejected by the
+    field contract. Generation is fully determined by `seed`.
+
+    Optional fields are absent with `optional_ratio` probability. Branches of
+    `Or` and `choose_by_field` are chosen by `choose(alternatives, rng)`
+    returning the index of the alternative (uniformly by default). Functions
+    w/o arguments generating the input of the fields with unsupported
+    contracts can be provided in `fields` mapping.
+
+    Record hooks are not taken into account, so inputs of records with
+    invariants can be rejected.
+
+    '''
+
+    def __init__(
+            self, record_type, seed=None, invalid_ratio=0.0, optional_ratio=0.2,
+            choose=_choose_uniformly, fields=None, max_depth=8
+    ):
+        if isinstance(record_type, Factory):
+            record_type = record_type.record_type
+        self._record_type = record_type
+        self._rng = random.Random(seed)
+        self._invalid_ratio = invalid_ratio
+        context = _Context(self._rng, choose, optional_ratio, max_depth)
+        self._gen_row = _compile_row_generator(record_type, context, fields or {})
+        self._invalid_values = [
+            (name, values) for name, values in (
+                (name, _get_invalid_values(record_type, name))
+                for name in record_type._fields
+            )
+            if values
+        ]
+        if invalid_ratio and not self._invalid_values:
+            raise TypeError(
+                "Can't generate invalid input for {}".format(record_type.__name__)
+            )
+
+    @property
+    def record_type(self):
+        return self._record_type
+
+    def _corrupt(self, row):
+        rng = self._rng
+        name, values = self._invalid_values[int(rng.random() * len(self._invalid_values))]
+        value = values[int(rng.random() * len(values))]
+        if value is missing_value:
+            row.pop(name, None)
+        else:
+            row[name] = value
+        return row
+
+    def gen_labeled(self) -> typing.Iterator[typing.Tuple[dict, bool]]:
+        '''infinitely generate pairs (input, is_valid)'''
+        gen_row = self._gen_row
+        random = self._rng.random
+        invalid_ratio = self._invalid_ratio
+        corrupt = self._corrupt
+        while True:
+            if invalid_ratio and random() < invalid_ratio:
+                yield corrupt(gen_row()), False
+            else:
+                yield gen_row(), True
+
+    def __iter__(self):
+        gen_row = self._gen_row
+        if not self._invalid_ratio:
+            while True:
+                yield gen_row()
+        for row, _ in self.gen_labeled():
+            yield row
+
+    def take(self, count: int) -> list:
+        return list(itertools.islice(self, count))
+
+
+def generate_inputs(record_type, count=None, seed=None, **kwargs) -> typing.Iterator[dict]:
+    '''lazily generate `count` (infinite if None) inputs, see InputGenerator'''
+    res = iter(InputGenerator(record_type, seed, **kwargs))
+    return res if count is None else itertools.islice(res, count)
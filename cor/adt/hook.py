@@ -46,14 +46,22 @@ class Target(enum.Enum):
     Init = '_hook_init'
 
 
-def mark_hook(target: Target):
+def mark_hook(target: Target, forces=None):
+    '''mark function as the record hook for the target
+
+    `forces` are names of the fields used by the hook, LazyRecord converts
+    them on construction before running hooks.
+
+    '''
     def mark(fn):
         fn.hook_target = target
+        if forces is not None:
+            fn.hook_forces = tuple(forces)
         return fn
     return mark
 
 
-def field_hook(target: Target, hook_name: str, fn: typing.Callable):
+def field_hook(target: Target, hook_name: str, fn: typing.Callable, forces=()):
     '''construct hook factory for the field called corresponding to the target
 
     Hook function has signature fn(instance, name, value) where:
@@ -64,31 +72,35 @@ def field_hook(target: Target, hook_name: str, fn: typing.Callable):
 
     - value - corresponding field value
 
+    Hook forces the field it is attached to and other fields listed in
+    `forces` (see `mark_hook`).
+
     '''
     def create_invariant(field_name):
         @functools.wraps(fn)
-        @mark_hook(target)
+        @mark_hook(target, (field_name, *forces))
         def wrapper(obj):
             try:
                 return fn(obj, field_name, getattr(obj, field_name, None))
             except Exception as err:
                 raise error.InvalidFieldError(field_name, "Failed {} check".format(hook_name)) from err
 
+        wrapper.hook_field = field_name
         return wrapper
 
     return HooksFactory(None, create_invariant)
 
 
-def field_invariant(fn: typing.Callable):
+def field_invariant(fn: typing.Callable, forces=()):
     '''create record field invariant factory
 
     Hook should raise exception if invariant check is failed.
 
     '''
-    return field_hook(Target.PostInit, 'invariant', fn)
+    return field_hook(Target.PostInit, 'invariant', fn, forces)
 
 
-def field_aggregate(fn: typing.Callable):
+def field_aggregate(fn: typing.Callable, forces=()):
     '''create hook factory for the aggregate
 
     Fields are set not in the order of declaration - the reason why field can't
@@ -107,4 +119,4 @@ def field_aggregate(fn: typing.Callable):
     effects.
 
     '''
-    return field_hook(Target.Init, 'aggregate', fn)
+    return field_hook(Target.Init, 'aggregate', fn, forces)
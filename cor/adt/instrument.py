@@ -0,0 +1,317 @@
+'''Opt-in timing instrumentation of the record field operations
+
+When enabled, field operation trees of all record classes (existing and
+created later) are copied with each node wrapped into the timing node and
+record constructors are regenerated to use them. Disabling restores the
+original field preparers, so there is no overhead while instrumentation is
+off.
+
+Stats are aggregated by the record class name, field, node and operation
+type, so record classes created repeatedly (e.g. by `record_factory`) share
+the stats instead of adding new ones.
+
+'''
+import collections
+import copy
+import json
+import os
+import threading
+import time
+import types
+import weakref
+
+from .error import Failure
+from .operation import (
+    BinaryOperation,
+    compile_operation,
+    compile_try_operation,
+    compile_try_value_conversion,
+    compile_value_conversion,
+    Operation,
+    Or,
+)
+from . import record as _record
+
+
+OperationStats = collections.namedtuple(
+    'OperationStats',
+    'record field node operation info calls failures total_time max_time matches'
+)
+OperationStats.__doc__ = '''Timing of the field operation tree node
+
+`node` is the path of the node in the field operation tree: "root" for the
+whole field operation, "root.left", "root.right.left" etc. for the operands
+of binary operations. `matches` is (left, right) count of the matched
+alternatives for the `Or` node and None for other nodes.
+
+'''
+
+
+class _Stats:
+    __slots__ = ('record', 'field', 'node', 'op', 'calls', 'failures',
+                 'total_time', 'max_time', 'matches')
+
+    def __init__(self, record_type, field, node, op):
+        self.record = record_type.__qualname__
+        self.field = field
+        self.node = node
+        self.op = op
+        self.matches = [0, 0] if isinstance(op, Or) else None
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.failures = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        if self.matches is not None:
+            self.matches[:] = (0, 0)
+
+    def add(self, elapsed, is_failed):
+        self.calls += 1
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+        if is_failed:
+            self.failures += 1
+
+    def get(self):
+        return OperationStats(
+            self.record, self.field, self.node,
+            self.op.__class__.__name__, self.op.info,
+            self.calls, self.failures, self.total_time, self.max_time,
+            None if self.matches is None else tuple(self.matches)
+        )
+
+
+def _wrap(prepare, stats, match):
+    '''wrap compiled or non-compiled preparer to account the call in stats
+
+    `match` is (Or node stats, operand index) for the `Or` operands. Left
+    operand matches if it returns the value, right one matches if it is
+    succeeded.
+
+    '''
+    perf_counter = time.perf_counter
+    add = stats.add
+    if match is None:
+        matches, side = None, None
+    else:
+        (or_stats, side) = match
+        matches = or_stats.matches
+
+    def timed(field_name, value):
+        started = perf_counter()
+        try:
+            res = prepare(field_name, value)
+        except Exception:
+            add(perf_counter() - started, True)
+            raise
+        is_failed = type(res) is Failure
+        add(perf_counter() - started, is_failed)
+        if matches is not None and not is_failed and (side or res is not None):
+            matches[side] += 1
+        return res
+
+    return timed
+
+
+class _Instrumented(Operation):
+    '''Operation tree node accounting calls of the wrapped operation'''
+
+    def __init__(self, op, stats, match=None):
+        self._op = op
+        self._stats = stats
+        self._match = match
+        self._prepare = _wrap(op.prepare_field, stats, match)
+        self._try_prepare = _wrap(op.try_prepare_field, stats, match)
+
+    @property
+    def info(self):
+        return self._op.info
+
+    def prepare_field(self, field_name, values):
+        return self._prepare(field_name, values)
+
+    def try_prepare_field(self, field_name, values):
+        return self._try_prepare(field_name, values)
+
+
+@compile_value_conversion.register(_Instrumented)
+def _(op):
+    prepare = compile_value_conversion(op._op)
+    return None if prepare is None else _wrap(prepare, op._stats, op._match)
+
+
+@compile_try_value_conversion.register(_Instrumented)
+def _(op):
+    prepare = compile_try_value_conversion(op._op)
+    return None if prepare is None else _wrap(prepare, op._stats, op._match)
+
+
+def _instrument_tree(op, record_type, field, node, get_stats, match=None):
+    stats = get_stats(record_type, field, node, op)
+    if isinstance(op, BinaryOperation):
+        or_stats = stats if isinstance(op, Or) else None
+        op = copy.copy(op)
+        op._left, op._right = (
+            _instrument_tree(
+                operand, record_type, field, '{}.{}'.format(node, side_name),
+                get_stats, None if or_stats is None else (or_stats, side)
+            )
+            for side, (side_name, operand) in enumerate(
+                (('left', op._left), ('right', op._right))
+            )
+        )
+    return _Instrumented(op, stats, match)
+
+
+_lock = threading.RLock()
+_originals = weakref.WeakKeyDictionary()
+_stats = {}
+
+
+def _get_stats(record_type, field, node, op):
+    key = (record_type.__module__, record_type.__qualname__, field, node, op.__class__)
+    with _lock:
+        stats = _stats.get(key)
+        if stats is None:
+            stats = _stats[key] = _Stats(record_type, field, node, op)
+    return stats
+
+
+def _set_preparers(record_type, preparers, try_preparers):
+    record_type._preparers = preparers
+    record_type._try_preparers = try_preparers
+    if not _record._has_custom_init(record_type):
+        _record._compile_record_init(record_type)
+
+
+def _instrument(record_type):
+    if record_type in _originals or record_type._fields is _record.RecordBase._fields:
+        return
+
+    ops = {
+        name: _instrument_tree(op, record_type, name, 'root', _get_stats)
+        for name, op in record_type._fields.items()
+    }
+    _originals[record_type] = (record_type._preparers, record_type._try_preparers)
+    _set_preparers(
+        record_type,
+        types.MappingProxyType({
+            name: compile_operation(op) for name, op in ops.items()
+        }),
+        types.MappingProxyType({
+            name: compile_try_operation(op) for name, op in ops.items()
+        })
+    )
+
+
+def _gen_record_types(cls=_record.RecordBase):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _gen_record_types(subclass)
+
+
+def is_enabled() -> bool:
+    return _instrument in _record._record_type_observers
+
+
+def enable():
+    '''instrument all existing and new record classes
+
+    Stats collected before are discarded.
+
+    '''
+    with _lock:
+        if is_enabled():
+            return
+        _stats.clear()
+        _record._record_type_observers.append(_instrument)
+        for record_type in list(_gen_record_types()):
+            _instrument(record_type)
+
+
+def disable():
+    '''restore original field preparers, collected stats are kept'''
+    with _lock:
+        if not is_enabled():
+            return
+        _record._record_type_observers.remove(_instrument)
+        for record_type, (preparers, try_preparers) in list(_originals.items()):
+            _set_preparers(record_type, preparers, try_preparers)
+        _originals.clear()
+
+
+def reset():
+    '''reset collected stats'''
+    with _lock:
+        for stats in _stats.values():
+            stats.reset()
+
+
+def snapshot(include_unused=False) -> list:
+    '''get list of OperationStats of the instrumented operation nodes'''
+    with _lock:
+        return [
+            stats.get() for stats in _stats.values()
+            if include_unused or stats.calls
+        ]
+
+
+def _escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+_metrics = (
+    ('calls_total', 'counter', 'Number of operation calls', 'calls'),
+    ('failures_total', 'counter', 'Number of failed operation calls', 'failures'),
+    ('seconds_total', 'counter', 'Total time spent in the operation', 'total_time'),
+    ('seconds_max', 'gauge', 'Maximum time of the operation call', 'max_time'),
+)
+
+
+def to_prometheus(stats=None, prefix='cor_adt_operation') -> str:
+    '''format stats (`snapshot()` by default) as Prometheus text exposition'''
+    if stats is None:
+        stats = snapshot()
+
+    def gen_labels(item):
+        return ','.join(
+            '{}="{}"'.format(name, _escape_label(str(getattr(item, name))))
+            for name in ('record', 'field', 'node', 'operation')
+        )
+
+    lines = []
+    for suffix, metric_type, help_text, attr in _metrics:
+        name = '{}_{}'.format(prefix, suffix)
+        lines.append('# HELP {} {}'.format(name, help_text))
+        lines.append('# TYPE {} {}'.format(name, metric_type))
+        lines.extend(
+            '{}{{{}}} {}'.format(name, gen_labels(item), getattr(item, attr))
+            for item in stats
+        )
+
+    name = '{}_or_matches_total'.format(prefix)
+    lines.append('# HELP {} Number of matches of the "or" alternatives'.format(name))
+    lines.append('# TYPE {} counter'.format(name))
+    for item in stats:
+        if item.matches is None:
+            continue
+        for side, count in zip(('left', 'right'), item.matches):
+            lines.append('{}{{{},side="{}"}} {}'.format(
+                name, gen_labels(item), side, count
+            ))
+    return '\n'.join(lines) + '\n'
+
+
+def dump_json(file_or_path, stats=None):
+    '''write stats (`snapshot()` by default) as JSON list of objects'''
+    if stats is None:
+        stats = snapshot()
+    data = [item._asdict() for item in stats]
+    if isinstance(file_or_path, (str, os.PathLike)):
+        with open(file_or_path, 'w') as f:
+            json.dump(data, f, indent=2)
+    else:
+        json.dump(data, file_or_path, indent=2)
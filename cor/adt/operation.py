@@ -3,6 +3,7 @@ import collections
 import enum
 import functools
 import typing
+import weakref
 
 from . import error
 
@@ -44,6 +45,32 @@ def get_contract_info_for_enum(obj):
     return '{}({})'.format(obj.__name__, ', '.join('"{}"'.format(v.value) for v in obj))
 
 
+def _get_error_info(err):
+    return error.Deferred(get_contract_info, err)
+
+
+def _create_invalid_field_error(field_name, err):
+    res = error.InvalidFieldError(field_name, _get_error_info(err))
+    res.__cause__ = err
+    return res
+
+
+def _create_missing_field_error(field_name):
+    res = error.MissingFieldError(field_name)
+    res.__cause__ = KeyError(field_name)
+    return res
+
+
+def _create_condition_error(field_name, get_error, value):
+    return _create_invalid_field_error(field_name, get_error(value))
+
+
+def _chain_failures(failure, cause):
+    res = failure.error
+    res.__cause__ = cause.error
+    return res
+
+
 class Operation(abc.ABC):
     @property
     @abc.abstractmethod
@@ -61,6 +88,18 @@ class Operation(abc.ABC):
 
         '''
 
+    def try_prepare_field(self, field_name: str, values: collections.Mapping):
+        '''non-raising version of `prepare_field()`
+
+        Return `error.Failure` instead of raising exception if operation is
+        failed. Operations override it to avoid creation of exceptions.
+
+        '''
+        try:
+            return self.prepare_field(field_name, values)
+        except Exception as err:
+            return error.Failure.from_error(err)
+
     def __str__(self):
         return self.info
 
@@ -168,7 +207,22 @@ class UnaryOperation(Operation, CombineMixin):
         except error.Error:
             raise
         except Exception as err:
-            raise error.InvalidFieldError(field_name, get_contract_info(err)) from err
+            raise error.InvalidFieldError(field_name, _get_error_info(err)) from err
+
+    def _try_convert_field(self, field_name, value):
+        condition = getattr(self, '_condition', None)
+        try:
+            if condition is None:
+                return self._convert(value)
+            if condition(value):
+                return value
+        except error.Error as err:
+            return error.Failure.from_error(err)
+        except Exception as err:
+            return error.Failure(_create_invalid_field_error, field_name, err)
+        return error.Failure(
+            _create_condition_error, field_name, self._get_error, value
+        )
 
 
 class SimpleConversion(UnaryOperation):
@@ -187,10 +241,23 @@ class SimpleConversion(UnaryOperation):
         except KeyError as err:
             raise error.MissingFieldError(field_name) from err
         except Exception as err:
-            raise error.InvalidFieldError(field_name, get_contract_info(err)) from err
+            raise error.InvalidFieldError(field_name, _get_error_info(err)) from err
 
         return self._convert_field(field_name, input_data)
 
+    def try_prepare_field(self, field_name, values):
+        if not _owns_prepare_field(self, SimpleConversion):
+            return super().try_prepare_field(field_name, values)
+
+        try:
+            input_data = values[field_name]
+        except KeyError:
+            return error.Failure(_create_missing_field_error, field_name)
+        except Exception as err:
+            return error.Failure(_create_invalid_field_error, field_name, err)
+
+        return self._try_convert_field(field_name, input_data)
+
 
 class BinaryOperation(Operation):
     '''Operation combining two operations'''
@@ -220,24 +287,42 @@ class Pipe(BinaryOperation, CombineMixin):
             self._right.prepare_field(field_name, {**values, field_name: left_res})
         )
 
+    def try_prepare_field(self, field_name, values):
+        if not _owns_prepare_field(self, Pipe):
+            return super().try_prepare_field(field_name, values)
+
+        left_res = self._left.try_prepare_field(field_name, values)
+        if left_res is None or type(left_res) is error.Failure:
+            return left_res
+        return self._right.try_prepare_field(
+            field_name, {**values, field_name: left_res}
+        )
+
 
 class Or(BinaryOperation, CombineMixin):
     _operation_name = 'or'
 
     def prepare_field(self, field_name, values):
-        try:
-            res = self._left.prepare_field(field_name, values)
-        except Exception as err_left:
-            try:
-                return self._right.prepare_field(field_name, values)
-            except Exception as err_right:
-                raise err_right from err_left
-        else:
-            return (
-                self._right.prepare_field(field_name, values)
-                if res is None
-                else res
-            )
+        res = self.try_prepare_field(field_name, values)
+        if type(res) is error.Failure:
+            raise res.error
+        return res
+
+    def try_prepare_field(self, field_name, values):
+        if not _owns_prepare_field(self, Or):
+            return super().try_prepare_field(field_name, values)
+
+        res = self._left.try_prepare_field(field_name, values)
+        if type(res) is error.Failure:
+            res_right = self._right.try_prepare_field(field_name, values)
+            if type(res_right) is error.Failure:
+                return error.Failure(_chain_failures, res_right, res)
+            return res_right
+        return (
+            self._right.try_prepare_field(field_name, values)
+            if res is None
+            else res
+        )
 
 
 def describe_contract(info):
@@ -267,6 +352,23 @@ def tag_as_basic_type(v):
     return v.value
 
 
+_tag_indexes = weakref.WeakKeyDictionary()
+
+
+def get_tag_indexes(tag_type) -> tuple:
+    '''get ({member: index}, members) for the Tag class
+
+    Members are indexed in the declaration order, so binary formats storing
+    the index depend on it (it is the part of the record schema fingerprint).
+
+    '''
+    res = _tag_indexes.get(tag_type)
+    if res is None:
+        members = tuple(tag_type)
+        res = _tag_indexes[tag_type] = ({v: i for i, v in enumerate(members)}, members)
+    return res
+
+
 class _SkipMissing(UnaryOperation):
     def __init__(self):
         @describe_contract('skip missing')
@@ -321,17 +423,23 @@ generate_missing = _GenerateMissing
 def only_if(fn, info, err_cls=ValueError):
     cond = error.ensure_callable(fn)
 
+    def get_error(v):
+        return err_cls({
+            'info': "Value doesn't match condition",
+            'condition': info or repr(fn),
+            'value': v
+        })
+
     @describe_contract(lambda: 'accept only if ' + ContractInfo(info).contract)
     def convert_only_if(v):
         if not cond(v):
-            raise err_cls({
-                'info': "Value doesn't match condition",
-                'condition': info or repr(fn),
-                'value': v
-            })
+            raise get_error(v)
         return v
 
-    return convert(convert_only_if)
+    res = convert(convert_only_if)
+    res._condition = cond
+    res._get_error = get_error
+    return res
 
 
 def expect_types(*expected_types):
@@ -345,7 +453,10 @@ def expect_types(*expected_types):
         'has type {}'.format(type_names[0]) if len(type_names) == 1
         else 'has one of {} types'.format(type_names)
     )
-    return only_if(has_expected_types, info, TypeError)
+    res = only_if(has_expected_types, info, TypeError)
+    res._check_key = ('has type', expected_types)
+    res._expected_types = expected_types
+    return res
 
 
 def expect_type(expected_type):
@@ -356,13 +467,65 @@ def should_be(expected):
     def is_value(v):
         return v is expected
 
-    return only_if(is_value, 'value is {} constant'.format(expected))
+    res = only_if(is_value, 'value is {} constant'.format(expected))
+    res._check_key = ('is', id(expected))
+    res._expected = expected
+    return res
 
 
 not_empty = only_if(bool, "not empty")
 
 
+def _gen_discriminants(op):
+    '''generate (value, expected) pairs for the discriminant field contract
+
+    Contract matches the value if it is the `expected` object or, if `expected`
+    is None, if value is equal to the pair `value`. Generate nothing if
+    contract is not a constant check.
+
+    '''
+    if isinstance(op, Pipe):
+        left, right = op._left, op._right
+        expected = getattr(right, '_expected', None)
+        if (isinstance(expected, enum.Enum)
+                and type(left) is SimpleConversion
+                and left._convert is type(expected)):
+            yield (expected, None)
+            yield (expected.value, None)
+    elif isinstance(op, SimpleConversion) and hasattr(op, '_expected'):
+        expected = op._expected
+        yield (expected, None if isinstance(expected, enum.Enum) else expected)
+
+
+def _get_dispatch_table(name, union_factories):
+    '''map discriminant field values to factories
+
+    Return None if some factory has unsupported discriminant contract.
+
+    '''
+    table = {}
+    for factory in union_factories:
+        conversion = factory.record_type.get_contract().get(name)
+        discriminants = list(_gen_discriminants(conversion))
+        if not discriminants:
+            return None
+        for value, expected in discriminants:
+            try:
+                table.setdefault(value, (factory, expected))
+            except TypeError:
+                return None
+    return table
+
+
 def choose_by_field(name, union_factories):
+    '''choose record factory by the value of the discriminant field
+
+    If all records discriminant fields contracts are constant checks
+    (`should_be(Tag.X)` or `convert(Tag) >> should_be(Tag.X)`) the factory is
+    found by the field value lookup. Otherwise factories are tried in turn.
+
+    '''
+    from .record import Factory
     assert(all(isinstance(cls, Factory) for cls in union_factories))
 
     def _get_choice_info():
@@ -373,22 +536,988 @@ def choose_by_field(name, union_factories):
                 ' {} field to create one'.format(_get_choice_info(), name)
         )
 
-    @describe_contract(_get_contract_info)
-    def create(data):
-        matched_cls = None
+    def _get_no_match_info():
+        return "Can't find match for any of ({})".format(_get_choice_info())
+
+    table = _get_dispatch_table(name, union_factories)
+
+    def find_factory(data):
         for cls in union_factories:
             try:
-                cls.prepare_field_from_input(name, data)
-                matched_cls = cls
-                break
+                cls.record_type.prepare_field_from_input(name, data)
+                return cls
             except Exception as err:
                 continue
-        if matched_cls is None:
-            raise error.InvalidFieldError(
-                name,
-                "Can't find match for any of ({})".format(_get_choice_info())
+        raise error.InvalidFieldError(name, error.Deferred(_get_no_match_info))
+
+    def select(data):
+        if table is not None:
+            try:
+                value = data[name]
+                cls, expected = table[value]
+            except Exception:
+                pass
+            else:
+                if expected is None or value is expected:
+                    return cls
+
+        return find_factory(data)
+
+    @describe_contract(_get_contract_info)
+    def create(data):
+        return select(data)(data)
+
+    res = convert(create)
+    res._choice = (name, tuple(union_factories))
+    res._select = select
+    return res
+
+
+class _Missing:
+    def __repr__(self):
+        return 'missing'
+
+
+missing_value = _Missing()
+
+
+def _owns_prepare_field(op, cls):
+    return type(op).prepare_field is cls.prepare_field
+
+
+@functools.singledispatch
+def compile_value_conversion(op):
+    '''compile operation tree into the value-level callable
+
+    Compiled callable has signature fn(field_name, value), where `value` is
+    the field input value or `missing_value` if the field is absent in the
+    input. It returns the same result and raises the same errors as
+    `op.prepare_field()` but the input mapping is not rebuilt on each pipe
+    step. Return None if the operation (or any of its nodes) depends on the
+    whole input mapping and can't be compiled.
+
+    '''
+    return None
+
+
+@functools.singledispatch
+def compile_try_value_conversion(op):
+    '''compile operation tree into the non-raising value-level callable
+
+    The same as `compile_value_conversion()` but compiled callable returns
+    `error.Failure` instead of raising an exception, like
+    `op.try_prepare_field()`.
+
+    '''
+    return None
+
+
+def _compile_convert(convert, reject_missing):
+    def prepare(field_name, value):
+        if value is missing_value:
+            if reject_missing:
+                raise error.MissingFieldError(field_name) from KeyError(field_name)
+            value = None
+        try:
+            return convert(value)
+        except error.Error:
+            raise
+        except Exception as err:
+            raise error.InvalidFieldError(field_name, _get_error_info(err)) from err
+
+    return prepare
+
+
+def _compile_try_convert(convert, reject_missing):
+    def try_prepare(field_name, value):
+        if value is missing_value:
+            if reject_missing:
+                return error.Failure(_create_missing_field_error, field_name)
+            value = None
+        try:
+            return convert(value)
+        except error.Error as err:
+            return error.Failure.from_error(err)
+        except Exception as err:
+            return error.Failure(_create_invalid_field_error, field_name, err)
+
+    return try_prepare
+
+
+def _compile_try_check(condition, get_error):
+    def try_prepare(field_name, value):
+        if value is missing_value:
+            return error.Failure(_create_missing_field_error, field_name)
+        try:
+            if condition(value):
+                return value
+        except error.Error as err:
+            return error.Failure.from_error(err)
+        except Exception as err:
+            return error.Failure(_create_invalid_field_error, field_name, err)
+        return error.Failure(_create_condition_error, field_name, get_error, value)
+
+    return try_prepare
+
+
+def compile_simple_conversion(op, convert):
+    '''compile SimpleConversion-like operation applying `convert`'''
+    if not _owns_prepare_field(op, SimpleConversion):
+        return None
+    return _compile_convert(convert, True)
+
+
+def compile_try_simple_conversion(op, convert):
+    '''compile non-raising SimpleConversion-like operation applying `convert`'''
+    if not _owns_prepare_field(op, SimpleConversion):
+        return None
+    if hasattr(op, '_condition'):
+        return _compile_try_check(op._condition, op._get_error)
+    return _compile_try_convert(convert, True)
+
+
+@compile_value_conversion.register(SimpleConversion)
+def _(op):
+    return compile_simple_conversion(op, op._convert)
+
+
+@compile_try_value_conversion.register(SimpleConversion)
+def _(op):
+    return compile_try_simple_conversion(op, op._convert)
+
+
+@compile_value_conversion.register(_Something)
+def _(op):
+    if not _owns_prepare_field(op, _Something):
+        return None
+
+    def prepare(field_name, value):
+        if value is missing_value:
+            raise KeyError(field_name)
+        return value
+
+    return prepare
+
+
+@compile_try_value_conversion.register(_Something)
+def _(op):
+    if not _owns_prepare_field(op, _Something):
+        return None
+
+    def try_prepare(field_name, value):
+        if value is missing_value:
+            return error.Failure(KeyError, field_name)
+        return value
+
+    return try_prepare
+
+
+def _prepare_optional(field_name, value):
+    return None if value is missing_value else value
+
+
+@compile_value_conversion.register(_Anything)
+@compile_try_value_conversion.register(_Anything)
+def _(op):
+    if not _owns_prepare_field(op, _Anything):
+        return None
+    return _prepare_optional
+
+
+@compile_value_conversion.register(_SkipMissing)
+@compile_try_value_conversion.register(_SkipMissing)
+def _(op):
+    if not _owns_prepare_field(op, _SkipMissing):
+        return None
+    return _prepare_optional
+
+
+@compile_value_conversion.register(_ProvideMissing)
+def _(op):
+    if not _owns_prepare_field(op, _ProvideMissing):
+        return None
+    return _compile_convert(op._convert, False)
+
+
+@compile_try_value_conversion.register(_ProvideMissing)
+def _(op):
+    if not _owns_prepare_field(op, _ProvideMissing):
+        return None
+    return _compile_try_convert(op._convert, False)
+
+
+@compile_value_conversion.register(_GenerateMissing)
+def _(op):
+    if not _owns_prepare_field(op, _GenerateMissing):
+        return None
+    return _compile_convert(op._convert, False)
+
+
+@compile_try_value_conversion.register(_GenerateMissing)
+def _(op):
+    if not _owns_prepare_field(op, _GenerateMissing):
+        return None
+    return _compile_try_convert(op._convert, False)
+
+
+def _gen_pipe_steps(op):
+    if isinstance(op, Pipe) and _owns_prepare_field(op, Pipe):
+        yield from _gen_pipe_steps(op._left)
+        yield from _gen_pipe_steps(op._right)
+    else:
+        yield op
+
+
+def _gen_deduplicated_steps(steps):
+    '''skip repeated pure checks of the same value
+
+    Check (`only_if` result) passes the value through, so the same pure check
+    (e.g. `expect_type`) applied again before any conversion will give the
+    same result.
+
+    '''
+    passed_checks = set()
+    for step in steps:
+        if not hasattr(step, '_condition'):
+            passed_checks.clear()
+            yield step
+            continue
+
+        key = getattr(step, '_check_key', None)
+        if key is None:
+            yield step
+        elif key not in passed_checks:
+            passed_checks.add(key)
+            yield step
+
+
+def _compile_pipe_steps(op, compile_step):
+    steps = [
+        compile_step(step)
+        for step in _gen_deduplicated_steps(_gen_pipe_steps(op))
+    ]
+    return None if any(step is None for step in steps) else steps
+
+
+@compile_value_conversion.register(Pipe)
+def _(op):
+    if not _owns_prepare_field(op, Pipe):
+        return None
+
+    steps = _compile_pipe_steps(op, compile_value_conversion)
+    if steps is None:
+        return None
+
+    if len(steps) == 1:
+        return steps[0]
+
+    first, *tail = steps
+    if len(tail) == 1:
+        second, = tail
+
+        def prepare(field_name, value):
+            value = first(field_name, value)
+            return None if value is None else second(field_name, value)
+
+        return prepare
+
+    def prepare(field_name, value):
+        value = first(field_name, value)
+        for step in tail:
+            if value is None:
+                return None
+            value = step(field_name, value)
+        return value
+
+    return prepare
+
+
+@compile_try_value_conversion.register(Pipe)
+def _(op):
+    if not _owns_prepare_field(op, Pipe):
+        return None
+
+    steps = _compile_pipe_steps(op, compile_try_value_conversion)
+    if steps is None:
+        return None
+
+    if len(steps) == 1:
+        return steps[0]
+
+    failure_type = error.Failure
+
+    def try_prepare(field_name, value):
+        for step in steps:
+            value = step(field_name, value)
+            if value is None or type(value) is failure_type:
+                return value
+        return value
+
+    return try_prepare
+
+
+def _compile_or(op):
+    if not _owns_prepare_field(op, Or):
+        return None
+
+    left = compile_try_value_conversion(op._left)
+    right = compile_try_value_conversion(op._right)
+    return None if left is None or right is None else (left, right)
+
+
+@compile_value_conversion.register(Or)
+def _(op):
+    branches = _compile_or(op)
+    if branches is None:
+        return None
+
+    try_left, try_right = branches
+    right = compile_value_conversion(op._right)
+    failure_type = error.Failure
+
+    def prepare(field_name, value):
+        res = try_left(field_name, value)
+        if type(res) is failure_type:
+            res_right = try_right(field_name, value)
+            if type(res_right) is failure_type:
+                raise _chain_failures(res_right, res)
+            return res_right
+        return right(field_name, value) if res is None else res
+
+    return prepare
+
+
+@compile_try_value_conversion.register(Or)
+def _(op):
+    branches = _compile_or(op)
+    if branches is None:
+        return None
+
+    try_left, try_right = branches
+    failure_type = error.Failure
+
+    def try_prepare(field_name, value):
+        res = try_left(field_name, value)
+        if type(res) is failure_type:
+            res_right = try_right(field_name, value)
+            if type(res_right) is failure_type:
+                return failure_type(_chain_failures, res_right, res)
+            return res_right
+        return try_right(field_name, value) if res is None else res
+
+    return try_prepare
+
+
+def compile_operation(op: Operation) -> typing.Callable:
+    '''get function equivalent to `op.prepare_field` for the record fields table
+
+    Input value is extracted once and passed through the compiled operation
+    tree (see `compile_value_conversion`). Falls back to the operation
+    `prepare_field` if the tree can't be compiled.
+
+    '''
+    prepare_value = compile_value_conversion(op)
+    if prepare_value is None:
+        return op.prepare_field
+
+    def prepare_field(field_name, values):
+        try:
+            value = values[field_name]
+        except KeyError:
+            value = missing_value
+        except Exception:
+            return op.prepare_field(field_name, values)
+        return prepare_value(field_name, value)
+
+    return prepare_field
+
+
+def compile_try_operation(op: Operation) -> typing.Callable:
+    '''get function equivalent to `op.try_prepare_field`
+
+    See `compile_operation()`.
+
+    '''
+    try_prepare_value = compile_try_value_conversion(op)
+    if try_prepare_value is None:
+        return op.try_prepare_field
+
+    def try_prepare_field(field_name, values):
+        try:
+            value = values[field_name]
+        except KeyError:
+            value = missing_value
+        except Exception:
+            return op.try_prepare_field(field_name, values)
+        return try_prepare_value(field_name, value)
+
+    return try_prepare_field
+
+
+@functools.singledispatch
+def get_result_type(op) -> typing.Optional[type]:
+    '''get type of the operation result if it can be deduced from the contract
+
+    Non-None operation result is an instance of returned type (or its
+    subclass). Return None if type is unknown.
+
+    '''
+    return None
+
+
+@get_result_type.register(SimpleConversion)
+def _(op):
+    if hasattr(op, '_expected'):
+        return type(op._expected)
+
+    expected_types = getattr(op, '_expected_types', ())
+    if len(expected_types) == 1:
+        return expected_types[0]
+
+    if not hasattr(op, '_condition') and isinstance(op._convert, type):
+        return op._convert
+    return None
+
+
+@get_result_type.register(Pipe)
+def _(op):
+    res = get_result_type(op._right)
+    if res is None and hasattr(op._right, '_condition'):
+        res = get_result_type(op._left)
+    return res
+
+
+@get_result_type.register(Or)
+def _(op):
+    left = get_result_type(op._left)
+    return left if left is get_result_type(op._right) else None
+
+
+CacheInfo = collections.namedtuple(
+    'CacheInfo', 'hits misses evictions maxsize currsize'
+)
+
+
+def _get_memo_key(value):
+    '''get key distinguishing equal values of different types, e.g. 1 and 1.0
+
+    Mappings and tuples are converted recursively, other unhashable values
+    cause TypeError.
+
+    '''
+    if isinstance(value, collections.Mapping):
+        return (value.__class__, frozenset(
+            (_get_memo_key(k), _get_memo_key(v)) for k, v in value.items()
+        ))
+    if isinstance(value, tuple):
+        return (value.__class__, tuple(map(_get_memo_key, value)))
+    return (value.__class__, value)
+
+
+class Memoized(Operation, CombineMixin):
+    '''Operation caching results of the wrapped operation by the input value
+
+    Only successful results are cached, errors are raised (or returned as
+    Failure) each time. Values are looked up by `key(value)`, by default it
+    is the pair of the value type and the value itself (or the frozenset of
+    items keys for mappings and tuple of items keys for tuples). Values with
+    unhashable keys are converted w/o caching. Least recently used results
+    are evicted if there are more than `maxsize` of them (no limit if it is
+    None). Asynchronous operations (see `is_async_operation()`) are cached
+    only when applied by `aprepare_field()`.
+
+    '''
+    def __init__(self, op: Operation, maxsize=1024, key=None):
+        self._op = op
+        self._maxsize = maxsize
+        self._get_key = key or _get_memo_key
+        self._cache = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        if is_async_operation(op):
+            # can be applied only asynchronously, see `_aprepare_field()`
+            self._prepare = self._try_prepare = None
+            return
+
+        prepare = compile_value_conversion(op)
+        try_prepare = compile_try_value_conversion(op)
+        if prepare is None or try_prepare is None:
+            raise TypeError(
+                "Operation depending on the whole input can't be memoized: {}"
+                .format(op.info)
             )
+        self._prepare = self._memoize(prepare)
+        self._try_prepare = self._memoize(try_prepare)
+
+    def _store(self, key, res):
+        cache = self._cache
+        cache[key] = res
+        if self._maxsize is not None and len(cache) > self._maxsize:
+            cache.popitem(last=False)
+            self._evictions += 1
+
+    async def _aprepare_field(self, field_name, values):
+        try:
+            value = values[field_name]
+        except KeyError:
+            value = missing_value
+        except Exception:
+            return await aprepare_field(self._op, field_name, values)
+
+        try:
+            key = self._get_key(value)
+            res = self._cache[key]
+        except KeyError:
+            pass
+        except TypeError:
+            return await aprepare_field(self._op, field_name, values)
+        else:
+            self._hits += 1
+            self._cache.move_to_end(key)
+            return res
+
+        self._misses += 1
+        res = await aprepare_field(self._op, field_name, values)
+        self._store(key, res)
+        return res
+
+    def _memoize(self, prepare):
+        cache = self._cache
+        get_key = self._get_key
+        maxsize = self._maxsize
+        failure_type = error.Failure
+
+        def memoized_prepare(field_name, value):
+            try:
+                key = get_key(value)
+                res = cache[key]
+            except KeyError:
+                pass
+            except TypeError:
+                return prepare(field_name, value)
+            else:
+                self._hits += 1
+                cache.move_to_end(key)
+                return res
+
+            self._misses += 1
+            res = prepare(field_name, value)
+            if type(res) is not failure_type:
+                cache[key] = res
+                if maxsize is not None and len(cache) > maxsize:
+                    cache.popitem(last=False)
+                    self._evictions += 1
+            return res
+
+        return memoized_prepare
+
+    @property
+    def info(self):
+        return self._op.info
+
+    @property
+    def operation(self) -> Operation:
+        return self._op
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(
+            self._hits, self._misses, self._evictions, self._maxsize,
+            len(self._cache)
+        )
+
+    def cache_clear(self):
+        self._cache.clear()
+        self._hits = self._misses = self._evictions = 0
+
+    def prepare_field(self, field_name, values):
+        if self._prepare is None:
+            return self._op.prepare_field(field_name, values)
+        try:
+            value = values[field_name]
+        except KeyError:
+            value = missing_value
+        except Exception:
+            return self._op.prepare_field(field_name, values)
+        return self._prepare(field_name, value)
+
+    def try_prepare_field(self, field_name, values):
+        if self._try_prepare is None:
+            return self._op.try_prepare_field(field_name, values)
+        try:
+            value = values[field_name]
+        except KeyError:
+            value = missing_value
+        except Exception:
+            return self._op.try_prepare_field(field_name, values)
+        return self._try_prepare(field_name, value)
+
+
+def memoized(op, maxsize=1024, key=None) -> Memoized:
+    '''cache results of the pure operation, see `Memoized`'''
+    return Memoized(default_conversion(op), maxsize, key)
+
+
+@compile_value_conversion.register(Memoized)
+def _(op):
+    return op._prepare
+
+
+@compile_try_value_conversion.register(Memoized)
+def _(op):
+    return op._try_prepare
+
+
+@get_result_type.register(Memoized)
+def _(op):
+    return get_result_type(op._op)
+
+
+@functools.singledispatch
+def is_async_operation(op) -> bool:
+    '''check if operation tree should be applied by `aprepare_field()`'''
+    return False
+
+
+@functools.singledispatch
+async def aprepare_field(op, field_name: str, values: collections.Mapping):
+    '''asynchronous version of `op.prepare_field()`
+
+    Operation trees containing asynchronous operations (see
+    `is_async_operation()`) can be applied only by this function.
+
+    '''
+    return op.prepare_field(field_name, values)
+
+
+class AsyncConversion(Operation, CombineMixin):
+    '''Operation converting the input value using coroutine function `convert`
+
+    If field is missing the operation ends up in the MissingFieldError. It
+    can't be applied by synchronous `prepare_field()`, see
+    `aprepare_field()`.
+
+    '''
+
+    def __init__(self, convert):
+        self._convert = convert
+
+    @property
+    def info(self):
+        res = get_contract_info(self._convert)
+        return str(res) if isinstance(res, ContractInfo) else 'convert to ' + res
+
+    async def convert(self, value):
+        return await self._convert(value)
+
+    def prepare_field(self, field_name, values):
+        raise error.InvalidFieldError(
+            field_name, "Asynchronous operation can't be applied synchronously"
+        )
+
+
+@is_async_operation.register(AsyncConversion)
+def _(op):
+    return True
+
+
+@is_async_operation.register(BinaryOperation)
+def _(op):
+    return is_async_operation(op._left) or is_async_operation(op._right)
+
+
+@aprepare_field.register(AsyncConversion)
+async def _(op, field_name, values):
+    try:
+        input_data = values[field_name]
+    except KeyError as err:
+        raise error.MissingFieldError(field_name) from err
+    except Exception as err:
+        raise error.InvalidFieldError(field_name, _get_error_info(err)) from err
+
+    try:
+        return await op._convert(input_data)
+    except error.Error:
+        raise
+    except Exception as err:
+        raise error.InvalidFieldError(field_name, _get_error_info(err)) from err
+
+
+@is_async_operation.register(Memoized)
+def _(op):
+    return is_async_operation(op._op)
+
+
+@aprepare_field.register(Memoized)
+async def _(op, field_name, values):
+    if not is_async_operation(op):
+        return op.prepare_field(field_name, values)
+    return await op._aprepare_field(field_name, values)
+
+
+@aprepare_field.register(Pipe)
+async def _(op, field_name, values):
+    if not is_async_operation(op):
+        return op.prepare_field(field_name, values)
+
+    left_res = await aprepare_field(op._left, field_name, values)
+    if left_res is None:
+        return None
+    return await aprepare_field(
+        op._right, field_name, {**values, field_name: left_res}
+    )
+
+
+@aprepare_field.register(Or)
+async def _(op, field_name, values):
+    if not is_async_operation(op):
+        return op.prepare_field(field_name, values)
+
+    try:
+        res = await aprepare_field(op._left, field_name, values)
+    except Exception as left_err:
+        try:
+            return await aprepare_field(op._right, field_name, values)
+        except Exception as err:
+            raise err from left_err
+    return (
+        await aprepare_field(op._right, field_name, values)
+        if res is None
+        else res
+    )
+
+
+@functools.singledispatch
+def excludes(op, other) -> bool:
+    '''check if operations can't both return non-None value for the same input
+
+    Alternatives of the adaptive `Or` (see `adaptive()`) can be reordered only
+    if they exclude each other. The relation is symmetric, so it is enough to
+    register the check for one of the operation types.
+
+    '''
+    return False
+
+
+def are_exclusive(op, other) -> bool:
+    return excludes(op, other) or excludes(other, op)
+
+
+def _can_have_common_instance(left: type, right: type):
+    if issubclass(left, right) or issubclass(right, left):
+        return True
+    if isinstance(left, abc.ABCMeta) or isinstance(right, abc.ABCMeta):
+        return True
+    try:
+        type('_Common', (left, right), {})
+    except TypeError:
+        return False
+    return True
+
+
+@excludes.register(SimpleConversion)
+def _(op, other):
+    if not (_owns_prepare_field(op, SimpleConversion)
+            and _owns_prepare_field(other, SimpleConversion)):
+        return False
+
+    if hasattr(op, '_expected'):
+        expected = op._expected
+        if expected is None:
+            return False
+        if hasattr(other, '_expected'):
+            return other._expected is not None and other._expected is not expected
+        other_types = getattr(other, '_expected_types', None)
+        return other_types is not None and not isinstance(expected, other_types)
+
+    types = getattr(op, '_expected_types', None)
+    other_types = getattr(other, '_expected_types', None)
+    if types is None or other_types is None:
+        return False
+    if type(None) in types or type(None) in other_types:
+        return False
+    return not any(
+        _can_have_common_instance(left, right)
+        for left in types for right in other_types
+    )
+
+
+@excludes.register(Pipe)
+def _(op, other):
+    # pipe result is not None only if its check (e.g. `expect_type`) is passed
+    left = op._left
+    return (
+        _owns_prepare_field(op, Pipe)
+        and hasattr(left, '_condition')
+        and are_exclusive(left, other)
+    )
+
+
+def _gen_or_alternatives(op):
+    if isinstance(op, Or) and _owns_prepare_field(op, Or):
+        yield from _gen_or_alternatives(op._left)
+        yield op._right
+    else:
+        yield op
+
+
+def _gen_exclusive_groups(alternatives):
+    '''split indexes of alternatives into groups of mutually exclusive ones'''
+    group = []
+    for i, op in enumerate(alternatives):
+        if not all(are_exclusive(alternatives[j], op) for j in group):
+            yield group
+            group = []
+        group.append(i)
+    yield group
+
+
+class AdaptiveOr(Operation, CombineMixin):
+    '''Chain of `Or` alternatives tried in the order of their match frequency
+
+    Only adjacent alternatives excluding each other (see `excludes()`) are
+    reordered, so for the same input the first alternative returning the
+    value is the same as for the declared order. Alternatives are reordered
+    after each `period` applications and hit counters are halved then to
+    follow the input changes. If no alternative returns the value the result
+    is built from the alternatives results in the declared order, so errors
+    are the same as for the original `Or`.
+
+    '''
+    def __init__(self, op: Operation, period=1000):
+        self._op = op
+        self._alternatives = tuple(_gen_or_alternatives(op))
+        self._period = period
+        self._calls = 0
+        self._hits = [0] * len(self._alternatives)
+        self._groups = tuple(
+            tuple(group)
+            for group in _gen_exclusive_groups(self._alternatives)
+        )
+        self._evaluate = self._compile_evaluate(
+            [alt.try_prepare_field for alt in self._alternatives]
+        )
+        try_alternatives = [
+            compile_try_value_conversion(alt) for alt in self._alternatives
+        ]
+        self._try_prepare = (
+            None if any(alt is None for alt in try_alternatives)
+            else self._compile_evaluate(try_alternatives)
+        )
+
+    def _reorder(self):
+        hits = self._hits
+        self._groups = tuple(
+            tuple(sorted(group, key=lambda i: -hits[i]))
+            for group in self._groups
+        )
+        self._hits = [count // 2 for count in hits]
+        self._calls = 0
+
+    def _compile_evaluate(self, try_alternatives):
+        failure_type = error.Failure
+        period = self._period
+
+        def evaluate(field_name, arg):
+            self._calls += 1
+            if self._calls >= period:
+                self._reorder()
+
+            results = [None] * len(try_alternatives)
+            for group in self._groups:
+                for i in group:
+                    res = try_alternatives[i](field_name, arg)
+                    if res is not None and type(res) is not failure_type:
+                        self._hits[i] += 1
+                        return res
+                    results[i] = res
+
+            res, *tail = results
+            for res_right in tail:
+                if type(res) is failure_type and type(res_right) is failure_type:
+                    res = failure_type(_chain_failures, res_right, res)
+                else:
+                    res = res_right
+            return res
+
+        return evaluate
+
+    @property
+    def info(self):
+        return self._op.info
+
+    @property
+    def operation(self) -> Operation:
+        return self._op
+
+    @property
+    def order(self) -> tuple:
+        '''alternatives in the current order of application'''
+        return tuple(self._alternatives[i] for group in self._groups for i in group)
+
+    def try_prepare_field(self, field_name, values):
+        if self._try_prepare is None:
+            return self._evaluate(field_name, values)
+
+        try:
+            value = values[field_name]
+        except KeyError:
+            value = missing_value
+        except Exception:
+            return self._evaluate(field_name, values)
+        return self._try_prepare(field_name, value)
+
+    def prepare_field(self, field_name, values):
+        res = self.try_prepare_field(field_name, values)
+        if type(res) is error.Failure:
+            raise res.error
+        return res
+
+
+def adaptive(op, period=1000) -> AdaptiveOr:
+    '''apply `Or` chain alternatives in the order of their match frequency
+
+    See `AdaptiveOr`.
+
+    '''
+    return AdaptiveOr(default_conversion(op), period)
+
+
+@compile_value_conversion.register(AdaptiveOr)
+def _(op):
+    try_prepare = op._try_prepare
+    if try_prepare is None:
+        return None
+
+    failure_type = error.Failure
+
+    def prepare(field_name, value):
+        res = try_prepare(field_name, value)
+        if type(res) is failure_type:
+            raise res.error
+        return res
+
+    return prepare
+
+
+@compile_try_value_conversion.register(AdaptiveOr)
+def _(op):
+    return op._try_prepare
+
+
+@get_result_type.register(AdaptiveOr)
+def _(op):
+    return get_result_type(op._op)
+
+
+@is_async_operation.register(AdaptiveOr)
+def _(op):
+    return is_async_operation(op._op)
 
-        return cls(data)
 
-    return convert(create)
+@aprepare_field.register(AdaptiveOr)
+async def _(op, field_name, values):
+    # asynchronous alternatives are applied in the declared order
+    if not is_async_operation(op):
+        return op.prepare_field(field_name, values)
+    return await aprepare_field(op._op, field_name, values)
@@ -0,0 +1,81 @@
+import concurrent.futures
+import itertools
+import multiprocessing
+
+from .record import (
+    _find_record_type_by_reference,
+    _get_pickle_reference,
+    BatchResult,
+    RowError,
+)
+
+
+def _gen_chunks(iterable, chunk_size):
+    it = iter(iterable)
+    start = 0
+    while True:
+        chunk = list(itertools.islice(it, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def _get_default_context():
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def _build_chunk(reference, start, rows, on_error):
+    factory = _find_record_type_by_reference(reference).get_factory()
+    records, errors = factory.build_many(rows, on_error=on_error)
+    return BatchResult(
+        records,
+        [RowError(start + index, err) for index, err in errors]
+    )
+
+
+def build_parallel(
+        factory, iterable, on_error='raise', chunk_size=1000, max_workers=None,
+        mp_context=None
+):
+    '''construct records from the input mappings using pool of processes
+
+    Input is split into chunks of `chunk_size` mappings validated by
+    `Factory.build_many()` in the worker processes, see it for the `on_error`
+    policies. Records are returned in the input order and RowError indexes
+    refer to the whole input.
+
+    Workers are forked by default, other start method can be set by
+    `mp_context`. Record classes which can't be imported by the qualified
+    name, e.g. created by `record_factory`, are found by the schema
+    fingerprint. Spawned workers import the module creating the class to find
+    it, so only the classes created on the module import are supported.
+
+    '''
+    if on_error not in ('raise', 'skip', 'collect'):
+        raise ValueError("Unknown error policy: {}".format(on_error))
+
+    reference = _get_pickle_reference(factory.record_type)
+    records = []
+    errors = []
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=mp_context or _get_default_context()
+    ) as executor:
+        futures = [
+            executor.submit(_build_chunk, reference, start, chunk, on_error)
+            for start, chunk in _gen_chunks(iterable, chunk_size)
+        ]
+        try:
+            for future in futures:
+                chunk_records, chunk_errors = future.result()
+                records.extend(chunk_records)
+                errors.extend(chunk_errors)
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+
+    return BatchResult(records, errors)
@@ -1,18 +1,42 @@
 import abc
+import asyncio
 import collections
+import copy
 import functools
+import hashlib
+import importlib
 import itertools
+import json
+import operator
+import os
+import re
+import sys
 import types
+import weakref
 
 from .error import *
 from .operation import (
+    _gen_discriminants,
+    _owns_prepare_field,
+    aprepare_field,
     as_basic_type,
+    compile_operation,
+    compile_simple_conversion,
+    compile_try_operation,
+    compile_try_simple_conversion,
+    compile_try_value_conversion,
+    compile_value_conversion,
     ContractInfo,
     convert,
     default_conversion,
+    excludes,
     get_contract_info,
+    get_result_type,
+    is_async_operation,
     Operation,
     SimpleConversion,
+    Tag,
+    tag_as_basic_type,
 )
 from .hook import (
     HooksFactory,
@@ -58,9 +82,466 @@ class RecordMixin:
     pass
 
 
+@functools.lru_cache(maxsize=256)
+def _compile_source(name, gen_source, args):
+    source = '\n'.join(gen_source(*args))
+    return compile(source, '<cor.adt {}>'.format(name), 'exec')
+
+
+def _compile_function(name, gen_source, args, namespace):
+    '''execute source generated by `gen_source(*args)` in the namespace
+
+    Generated source depends only on the record shape (field and hook counts)
+    but not on the class, so code objects are cached by the generator
+    arguments and only bound to the class-specific namespace.
+
+    '''
+    exec(_compile_source(name, gen_source, args), namespace)
+    return namespace[name]
+
+
+def _gen_fields_init(field_count, return_failure):
+    for i in range(field_count):
+        if return_failure:
+            yield 'res = _try_prepare_{0}(_name_{0}, values)'.format(i)
+            yield 'if res.__class__ is Failure:'
+            yield '    return res'
+        else:
+            yield 'try:'
+            yield '    res = _prepare_{0}(_name_{0}, values)'.format(i)
+            yield 'except FieldError:'
+            yield '    raise'
+            yield 'except Exception as err:'
+            yield '    raise InvalidFieldError(_name_{}, "input") from err'.format(i)
+        yield 'if res is not None:'
+        yield '    _set_{}(self, res)'.format(i)
+
+
+def _gen_init_finish(has_extra, init_hook_count):
+    if has_extra:
+        yield 'for k in values.keys() - _field_names:'
+        yield '    _object_setattr(self, k, values[k])'
+    for i in range(init_hook_count):
+        yield 'res = _init_hook_{}(self)'.format(i)
+        yield 'if res:'
+        yield '    name, value = res'
+        yield '    setattr(self, name, value)'
+
+
+def _indent(lines, level):
+    prefix = '    ' * level
+    for line in lines:
+        yield prefix + line
+
+
+def _gen_init_source(field_count, has_extra, init_hook_count, post_init_hook_count):
+    yield 'def __init__(self, values=None, **overrides):'
+    yield '    if self.__class__ is not _cls:'
+    yield '        return _generic_init(self, values, **overrides)'
+    yield '    if not values:'
+    yield '        values = overrides'
+    yield '    elif overrides:'
+    yield '        values = {**values, **overrides}'
+    yield '    try:'
+    yield '        _set_initialized(self, False)'
+    yield from _indent(_gen_fields_init(field_count, False), 2)
+    yield from _indent(_gen_init_finish(has_extra, init_hook_count), 2)
+    yield '        _set_initialized(self, True)'
+    yield '    except Exception as err:'
+    yield '        raise RecordError(_cls_name, "init") from err'
+    if post_init_hook_count:
+        yield '    try:'
+        for i in range(post_init_hook_count):
+            yield '        _post_init_hook_{}(self)'.format(i)
+        yield '    except Exception as err:'
+        yield '        raise RecordError(_cls_name, "post-init") from err'
+
+
+def _gen_try_create_source(field_count, has_extra, init_hook_count, post_init_hook_count):
+    yield 'def try_create(values):'
+    yield '    self = _new(_cls)'
+    yield '    _set_initialized(self, False)'
+    yield from _indent(_gen_fields_init(field_count, True), 1)
+    yield '    try:'
+    yield from _indent(_gen_init_finish(has_extra, init_hook_count), 2)
+    yield '        _set_initialized(self, True)'
+    for i in range(post_init_hook_count):
+        yield '        _post_init_hook_{}(self)'.format(i)
+    yield '    except Exception as err:'
+    yield '        return Failure.from_error(err)'
+    yield '    return self'
+
+
+def _has_custom_init(cls):
+    '''check if the record class or any of its record bases defines __init__'''
+    for base in cls.__mro__:
+        if base is RecordBase:
+            return False
+        init = vars(base).get('__init__')
+        if init is not None and not getattr(init, '_is_generated', False):
+            return True
+    return False
+
+
+def _gen_record_init_source(*counts):
+    yield from _gen_init_source(*counts)
+    yield from _gen_try_create_source(*counts)
+
+
+def _compile_record_init(cls):
+    '''generate straight-line constructor for the record class
+
+    Constructor is equivalent to `RecordBase.__init__` calling the standard
+    `_initialize` but it has field operations, slot setters and hooks resolved
+    at the class creation time. Classes providing own `_initialize` use the
+    generic constructor.
+
+    Also generate non-raising `_try_create(values)` returning the record or
+    the Failure of the field operation or hook. It uses `try_prepare_field`
+    protocol of field operations and doesn't create InvalidFieldError and
+    RecordError chain.
+
+    '''
+    if cls._initialize is Record._initialize:
+        has_extra = False
+    elif cls._initialize is ExtensibleRecord._initialize:
+        has_extra = True
+    else:
+        if getattr(cls.__init__, '_is_generated', False):
+            cls.__init__ = RecordBase.__init__
+        cls._try_create = None
+        return
+
+    fields = list(cls._preparers.items())
+    cls_dict = vars(cls)
+    init_hooks = getattr(cls, Target.Init.value, [])
+    post_init_hooks = getattr(cls, Target.PostInit.value, [])
+
+    namespace = {
+        '_cls': cls,
+        '_cls_name': cls.__name__,
+        '_generic_init': RecordBase.__init__,
+        '_new': object.__new__,
+        '_set_initialized': cls_dict['_initialized'].__set__,
+        '_field_names': frozenset(cls._fields),
+        '_object_setattr': object.__setattr__,
+        'Failure': Failure,
+        'FieldError': FieldError,
+        'InvalidFieldError': InvalidFieldError,
+        'RecordError': RecordError,
+    }
+    for i, (name, prepare) in enumerate(fields):
+        namespace['_name_{}'.format(i)] = name
+        namespace['_prepare_{}'.format(i)] = prepare
+        namespace['_try_prepare_{}'.format(i)] = cls._try_preparers[name]
+        namespace['_set_{}'.format(i)] = cls_dict[name].__set__
+    for i, hook in enumerate(init_hooks):
+        namespace['_init_hook_{}'.format(i)] = hook
+    for i, hook in enumerate(post_init_hooks):
+        namespace['_post_init_hook_{}'.format(i)] = hook
+
+    counts = (len(fields), has_extra, len(init_hooks), len(post_init_hooks))
+    init = _compile_function('__init__', _gen_record_init_source, counts, namespace)
+    init.__qualname__ = '{}.__init__'.format(cls.__qualname__)
+    init._is_generated = True
+    cls.__init__ = init
+    cls._try_create = staticmethod(namespace['try_create'])
+
+
+_record_types = weakref.WeakValueDictionary()
+
+# callables fn(record_type) called for each created record class
+_record_type_observers = []
+
+
+# memory addresses in the default `repr()` of functions and other objects
+_address_pattern = re.compile(r' at 0x[0-9a-fA-F]+')
+
+def _get_field_schema(op):
+    '''get field contract description including the nested record schema
+    fingerprint or the Tag members of the result type'''
+    res = get_contract_info(op)
+    result_type = get_result_type(op)
+    if not isinstance(result_type, type):
+        return res
+    if issubclass(result_type, RecordBase) and result_type._schema_fingerprint:
+        return '{} -> {}'.format(res, result_type._schema_fingerprint)
+    if issubclass(result_type, Tag):
+        return '{} -> {}'.format(res, ', '.join(
+            '{}={!r}'.format(member.name, member.value) for member in result_type
+        ))
+    return res
+
+
+def _get_schema_fingerprint(cls):
+    '''get fingerprint of the class schema
+
+    Fingerprint is the hash of the class module, qualified name, kind and
+    field contracts w/o memory addresses, so it is the same in all processes
+    creating the class. Fingerprints of the nested records and members of the
+    Tags returned by the fields are included. Classes with the same schema, e.g. created by the
+    same `record_factory` call repeatedly, have the same fingerprint.
+
+    '''
+    kind = next(
+        base.__name__ for base in cls.mro()
+        if base in (Record, ExtensibleRecord, LazyRecord)
+    )
+    schema = '\n'.join(itertools.chain(
+        (cls.__module__, cls.__qualname__, kind),
+        ('{} :: {}'.format(k, _get_field_schema(v)) for k, v in cls._fields.items())
+    ))
+    schema = _address_pattern.sub('', schema)
+    return hashlib.sha1(schema.encode('utf-8')).hexdigest()[:16]
+
+
+def find_record_type(fingerprint: str):
+    '''find record class by the schema fingerprint
+
+    All record classes including ones created dynamically by `record_factory`
+    are registered by the fingerprint of their schema, so they can be found in
+    the processes forked after the class creation or ones importing the
+    module creating the class. The last created class is found if there are
+    several classes with the same schema.
+
+    '''
+    try:
+        return _record_types[fingerprint]
+    except KeyError as err:
+        raise LookupError(
+            "Unknown record schema fingerprint: {}".format(fingerprint)
+        ) from err
+
+
+def _gen_from_state_source(field_count, has_extra):
+    yield 'def from_state(state, extra=None):'
+    yield '    self = _new(_cls)'
+    if field_count:
+        yield '    {}, = state'.format(', '.join('v{}'.format(i) for i in range(field_count)))
+    for i in range(field_count):
+        yield '    if v{} is not None:'.format(i)
+        yield '        _set_{0}(self, v{0})'.format(i)
+    if has_extra:
+        yield '    if extra:'
+        yield '        self.__dict__.update(extra)'
+    yield '    _set_initialized(self, True)'
+    yield '    return self'
+
+
+def _compile_record_state(cls):
+    '''generate functions to get and restore record state
+
+    State is the tuple of field values in the order of fields declaration.
+    Record is restored from the state w/o any validation.
+
+    '''
+    names = tuple(cls._fields)
+    cls._field_indexes = types.MappingProxyType(
+        {name: i for i, name in enumerate(names)}
+    )
+    if len(names) > 1:
+        cls._get_state = staticmethod(operator.attrgetter(*names))
+    elif names:
+        get_value = operator.attrgetter(*names)
+        cls._get_state = staticmethod(lambda obj: (get_value(obj),))
+    else:
+        cls._get_state = staticmethod(lambda obj: ())
+
+    cls_dict = vars(cls)
+    namespace = {
+        '_cls': cls,
+        '_new': object.__new__,
+        '_set_initialized': cls_dict['_initialized'].__set__,
+    }
+    for i, name in enumerate(names):
+        namespace['_set_{}'.format(i)] = cls_dict[name].__set__
+    has_extra = issubclass(cls, ExtensibleRecord)
+    from_state = _compile_function(
+        'from_state', _gen_from_state_source, (len(names), has_extra), namespace
+    )
+    cls._from_state = staticmethod(from_state)
+
+
+def _get_pickle_reference(cls):
+    '''class if it can be imported by the qualified name or pair of the class
+    module and schema fingerprint'''
+    try:
+        obj = importlib.import_module(cls.__module__)
+        for name in cls.__qualname__.split('.'):
+            obj = getattr(obj, name)
+    except (ImportError, AttributeError):
+        obj = None
+    return cls if obj is cls else (cls.__module__, cls._schema_fingerprint)
+
+
+def _find_record_type_by_reference(reference):
+    '''get record class by the result of `_get_pickle_reference`'''
+    if isinstance(reference, type):
+        return reference
+    if isinstance(reference, tuple):
+        module, reference = reference
+        # classes created on the module import are registered
+        importlib.import_module(module)
+    return find_record_type(reference)
+
+
+def _create_from_state(cls, state, extra=None, is_affected=None):
+    '''create record from already prepared field values running hooks
+
+    Only hooks passing `is_affected` filter are run if it is provided.
+
+    '''
+    res = cls._from_state(state, extra)
+    init_hooks = getattr(cls, Target.Init.value, [])
+    post_init_hooks = getattr(cls, Target.PostInit.value, [])
+    if is_affected is not None:
+        init_hooks = filter(is_affected, init_hooks)
+        post_init_hooks = filter(is_affected, post_init_hooks)
+
+    try:
+        object.__setattr__(res, '_initialized', False)
+        for hook in init_hooks:
+            hook_res = hook(res)
+            if hook_res:
+                name, value = hook_res
+                setattr(res, name, value)
+        object.__setattr__(res, '_initialized', True)
+    except Exception as err:
+        raise RecordError(cls.__name__, "init") from err
+
+    try:
+        for hook in post_init_hooks:
+            hook(res)
+    except Exception as err:
+        raise RecordError(cls.__name__, "post-init") from err
+    return res
+
+
+def _restore_record(cls, state, extra=None):
+    return _find_record_type_by_reference(cls)._from_state(state, extra)
+
+
+_scalar_types = frozenset((str, int, float, bool))
+
+
+def _get_basic_type_registry_size():
+    return len(as_basic_type.registry)
+
+
+def _gen_field_conversions(cls, namespace):
+    '''generate expression converting each field value to basic type
+
+    Dispatch is skipped for values of the field result type if it is the
+    scalar w/o own `as_basic_type` conversion, Tag or record.
+
+    '''
+    default = as_basic_type.dispatch(object)
+    for i, op in enumerate(cls._fields.values()):
+        v = 'v{}'.format(i)
+        slow = '_basic({})'.format(v)
+        result_type = get_result_type(op)
+        if result_type is None:
+            yield slow
+            continue
+
+        conversion = as_basic_type.dispatch(result_type)
+        if isinstance(result_type, type) and issubclass(result_type, RecordBase):
+            fast = '_record_as_basic_type({})'
+        elif conversion is tag_as_basic_type:
+            fast = '{}.value'
+        elif conversion is default and result_type in _scalar_types:
+            fast = '{}'
+        else:
+            yield slow
+            continue
+
+        namespace['_t{}'.format(i)] = result_type
+        yield '{} if {}.__class__ is _t{} else {}'.format(fast.format(v), v, i, slow)
+
+
+def _gen_serializer_source(field_count, conversions, has_extra):
+    yield 'def to_basic(obj):'
+    if field_count:
+        yield '    {}, = _get_state(obj)'.format(
+            ', '.join('v{}'.format(i) for i in range(field_count))
+        )
+    yield '    res = {{{}}}'.format(', '.join(
+        '_name_{}: {}'.format(i, expr) for i, expr in enumerate(conversions)
+    ))
+    if has_extra:
+        yield '    for k, v in obj.__dict__.items():'
+        yield '        res[k] = _basic(v)'
+    yield '    return res'
+
+
+def _compile_record_serializer(cls):
+    '''generate function converting record to basic types
+
+    Function is equivalent to the recursive `as_basic_type` but the field
+    order and types are resolved at the class creation. Generated code depends
+    on `as_basic_type` registrations, so it is generated on the first use and
+    regenerated if they are changed. Classes with own `gen_fields` or `gen_names` are converted
+    generically.
+
+    '''
+    if cls.gen_fields is not RecordBase.gen_fields or cls.gen_names not in (
+            Record.gen_names, ExtensibleRecord.gen_names
+    ):
+        cls._serializer = None
+        return None
+
+    namespace = {
+        '_get_state': cls._get_state,
+        '_basic': as_basic_type,
+        '_record_as_basic_type': record_as_basic_type,
+    }
+    for i, name in enumerate(cls._fields):
+        namespace['_name_{}'.format(i)] = name
+    conversions = tuple(_gen_field_conversions(cls, namespace))
+    has_extra = issubclass(cls, ExtensibleRecord)
+    to_basic = _compile_function(
+        'to_basic', _gen_serializer_source,
+        (len(conversions), conversions, has_extra), namespace
+    )
+    cls._serializer = (_get_basic_type_registry_size(), to_basic)
+    return to_basic
+
+
+def _get_record_serializer(cls):
+    res = vars(cls).get('_serializer')
+    if res is None or res[0] != _get_basic_type_registry_size():
+        return _compile_record_serializer(cls)
+    return res[1]
+
+
+_encode_json = json.JSONEncoder().encode
+
+
+def to_json(value, binary=False):
+    '''serialize value as `json.dumps(as_basic_type(value))` does
+
+    If `binary` is set, return ASCII-encoded bytes.
+
+    '''
+    res = _encode_json(as_basic_type(value))
+    return res.encode('ascii') if binary else res
+
+
 class RecordMeta(abc.ABCMeta):
     def __init__(cls, name, bases, namespace, **kwds):
         cls._factory = Factory(cls)
+        if bases[0] == RecordBase:
+            return
+
+        cls._schema_fingerprint = _get_schema_fingerprint(cls)
+        _record_types[cls._schema_fingerprint] = cls
+        _compile_record_state(cls)
+        if _has_custom_init(cls):
+            cls._try_create = None
+        else:
+            _compile_record_init(cls)
+        for observer in _record_type_observers:
+            observer(cls)
 
     def __new__(cls, name, bases, namespace, **kwds):
         record_base=bases[0]
@@ -85,11 +566,18 @@ class RecordMeta(abc.ABCMeta):
         slots = itertools.chain(
             fields.keys(),
             record_base._service_fields,
-            ['__dict__'] if record_base == ExtensibleRecord else []
+            ['__dict__'] if record_base == ExtensibleRecord else [],
+            [] if any(base.__weakrefoffset__ for base in bases) else ['__weakref__']
         )
 
         cls_dict = {
             '_fields': types.MappingProxyType(fields),
+            '_preparers': types.MappingProxyType({
+                k: compile_operation(v) for k, v in fields.items()
+            }),
+            '_try_preparers': types.MappingProxyType({
+                k: compile_try_operation(v) for k, v in fields.items()
+            }),
             '__slots__': tuple(slots),
             '_contract_info': ContractInfo('convert to' + name),
             '_factory': None
@@ -109,8 +597,13 @@ class RecordBase(collections.Mapping):
 
     __slots__ = tuple()
     _fields = {}
+    _preparers = {}
+    _try_preparers = {}
     _factory = None
-    _service_fields = ('_initialized',)
+    _try_create = None
+    _schema_fingerprint = None
+    _serializer = None
+    _service_fields = ('_initialized', '_hash')
 
     def __init__(self, values=None, **overrides):
         if not values:
@@ -144,9 +637,9 @@ class RecordBase(collections.Mapping):
     def gen_fields_from_input(cls, data: collections.Mapping):
         cls_name = cls.__name__
 
-        for name, conversion in cls._fields.items():
+        for name, prepare in cls._preparers.items():
             try:
-                res = conversion.prepare_field(name, data)
+                res = prepare(name, data)
                 if res is not None:
                     yield (name, res)
             except FieldError as err:
@@ -154,6 +647,23 @@ class RecordBase(collections.Mapping):
             except Exception as err:
                 raise InvalidFieldError(name, 'input') from err
 
+    @classmethod
+    def view(cls, values: collections.Mapping, cache=False):
+        '''get read-only RecordView of the input mapping'''
+        return RecordView(cls, values, cache)
+
+    @classmethod
+    def collect(cls, values, max_errors=100):
+        '''construct record validating all fields
+
+        Unlike the constructor stopping on the first error, all fields
+        including ones of the subrecords are validated and AggregateError with
+        the tree of field errors is raised. At most `max_errors` errors are
+        collected (no limit if it is None).
+
+        '''
+        return _collect(cls, values, max_errors)
+
     @classmethod
     def get_contract(cls) -> collections.Mapping:
         return cls._fields
@@ -164,8 +674,8 @@ class RecordBase(collections.Mapping):
 
     @classmethod
     def prepare_field_from_input(cls, name: str, data: collections.Mapping):
-        conversion = cls._fields[name]
-        return conversion.prepare_field(name, data)
+        prepare = cls._preparers[name]
+        return prepare(name, data)
 
     @classmethod
     def get_contract_info(cls):
@@ -174,6 +684,78 @@ class RecordBase(collections.Mapping):
             for name, conversion in cls._fields.items()
         )
 
+    def get_state(self) -> tuple:
+        '''get tuple of field values in the order of fields declaration'''
+        return self._get_state(self)
+
+    def replace(self, **changes):
+        '''create record with changed fields
+
+        Result is equal to `cls(record, **changes)` but only changed fields
+        are validated, values of other fields are reused as is. Only hooks
+        attached to the changed fields (and hooks not attached to any field)
+        are run.
+
+        '''
+        if not changes:
+            return self
+
+        cls = self.__class__
+        if cls._try_create is None:
+            return cls(self, **changes)
+
+        cls_name = cls.__name__
+        state = list(cls._get_state(self))
+        extra = dict(self.__dict__) if isinstance(self, ExtensibleRecord) else None
+        indexes = cls._field_indexes
+        preparers = cls._preparers
+        # operations can depend on other input values, input is the same as
+        # for the constructor
+        values = {**self, **changes}
+        try:
+            for name, value in changes.items():
+                i = indexes.get(name)
+                if i is None:
+                    if extra is not None:
+                        extra[name] = value
+                    continue
+                try:
+                    state[i] = preparers[name](name, values)
+                except FieldError:
+                    raise
+                except Exception as err:
+                    raise InvalidFieldError(name, "input") from err
+        except Exception as err:
+            raise RecordError(cls_name, "init") from err
+
+        def is_affected(hook):
+            name = getattr(hook, 'hook_field', None)
+            return name is None or name in changes
+
+        return _create_from_state(cls, tuple(state), extra, is_affected)
+
+    def __reduce__(self):
+        cls = self.__class__
+        reference = vars(cls).get('_pickle_reference')
+        if reference is None:
+            reference = cls._pickle_reference = _get_pickle_reference(cls)
+        extra = getattr(self, '__dict__', None)
+        return (
+            _restore_record,
+            (reference, self._get_state(self), extra or None)
+        )
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        res = self._from_state(
+            copy.deepcopy(self._get_state(self), memo),
+            copy.deepcopy(getattr(self, '__dict__', None), memo)
+        )
+        memo[id(self)] = res
+        return res
+
     def gen_fields(self):
         for name in self.gen_names():
             v = getattr(self, name, Ellipsis)
@@ -186,6 +768,18 @@ class RecordBase(collections.Mapping):
             yield name
 
     def __eq__(self, other):
+        if self is other:
+            return True
+
+        if other.__class__ is self.__class__:
+            get_state = self._get_state
+            if get_state(self) != get_state(other):
+                return False
+            return (
+                not isinstance(self, ExtensibleRecord)
+                or self.__dict__ == other.__dict__
+            )
+
         if isinstance(other, self.__class__):
             pairs = zip(self.gen_fields(), other.gen_fields())
             return all(a == b for a, b in pairs)
@@ -202,6 +796,21 @@ class RecordBase(collections.Mapping):
 
         return False
 
+    def __hash__(self):
+        '''hash of (name, value) pairs cached in the service slot
+
+        Hash doesn't depend on the fields order to be consistent with the
+        equality of records of different classes having the same fields.
+
+        '''
+        try:
+            return self._hash
+        except AttributeError:
+            pass
+        res = hash(frozenset(self.gen_fields()))
+        object.__setattr__(self, '_hash', res)
+        return res
+
     def __iter__(self):
         return iter(self.gen_names())
 
@@ -222,6 +831,208 @@ def get_contract_info_for_record(obj):
     return obj.get_contract_info()
 
 
+def _get_generic_try_create(record_type):
+    def try_create(values):
+        try:
+            return record_type(values)
+        except Exception as err:
+            return Failure.from_error(err)
+
+    return try_create
+
+
+class _ErrorCollector:
+    '''Validate all fields of the record and its subrecords collecting errors
+
+    Subrecords are the fields with the plain Factory or `choose_by_field`
+    contract, errors of other fields are collected as is. Evaluation is
+    stopped after `max_errors` leaf errors are collected.
+
+    '''
+    def __init__(self, max_errors):
+        self._max_errors = max_errors
+        self._count = 0
+        self._truncated = False
+
+    def _add(self, errors, name, err, counted=False):
+        if name not in errors:
+            errors[name] = err
+            if not counted:
+                self._count += 1
+
+    def _is_full(self):
+        return self._max_errors is not None and self._count >= self._max_errors
+
+    def collect(self, record_type, values):
+        '''return the record or the Failure'''
+        if record_type._try_create is None:
+            try:
+                return record_type(values)
+            except Exception as err:
+                self._count += 1
+                return Failure.from_error(err)
+
+        errors = {}
+        state = []
+        for name, op in record_type._fields.items():
+            if self._is_full():
+                self._truncated = True
+                break
+            count = self._count
+            res = self._prepare_field(record_type, name, op, values)
+            if res.__class__ is Failure:
+                # errors of the subrecord are counted by its own collection
+                self._add(errors, name, res.error, self._count != count)
+            else:
+                state.append(res)
+
+        if errors:
+            return self._failure(record_type.__name__, errors)
+        return self._create(record_type, tuple(state), values)
+
+    def _prepare_field(self, record_type, name, op, values):
+        if op.__class__ is Factory or hasattr(op, '_choice'):
+            try:
+                data = values[name]
+            except Exception:
+                pass
+            else:
+                if isinstance(data, collections.Mapping):
+                    return self._prepare_subrecord(op, data)
+
+        return record_type._try_preparers[name](name, values)
+
+    def _prepare_subrecord(self, op, data):
+        if op.__class__ is Factory:
+            return self.collect(op.record_type, data)
+
+        try:
+            factory = op._select(data)
+        except Exception:
+            name, factories = op._choice
+            variant_errors = {}
+            for factory in factories:
+                record_type = factory.record_type
+                res = record_type._try_preparers[name](name, data)
+                if res.__class__ is Failure:
+                    variant_errors[record_type.__name__] = res.error
+            return Failure.from_error(AggregateError(
+                name, variant_errors, info='no matching variant'
+            ))
+        return self.collect(factory.record_type, data)
+
+    def _create(self, record_type, state, values):
+        extra = None
+        if issubclass(record_type, ExtensibleRecord):
+            extra = {k: values[k] for k in values.keys() - record_type._fields.keys()}
+        record = record_type._from_state(state, extra)
+
+        errors = {}
+        set_initialized = vars(record_type)['_initialized'].__set__
+        set_initialized(record, False)
+        for hook in getattr(record_type, Target.Init.value, []):
+            try:
+                res = hook(record)
+                if res:
+                    name, value = res
+                    setattr(record, name, value)
+            except Exception as err:
+                self._add(errors, getattr(hook, 'hook_field', hook.__name__), err)
+        set_initialized(record, True)
+
+        if not errors:
+            for hook in getattr(record_type, Target.PostInit.value, []):
+                try:
+                    hook(record)
+                except Exception as err:
+                    self._add(errors, getattr(hook, 'hook_field', hook.__name__), err)
+
+        if errors:
+            return self._failure(record_type.__name__, errors)
+        return record
+
+    def _failure(self, name, errors):
+        return Failure.from_error(AggregateError(name, errors, self._truncated))
+
+
+def _collect(record_type, values, max_errors):
+    res = _ErrorCollector(max_errors).collect(record_type, values)
+    if res.__class__ is Failure:
+        raise res.error
+    return res
+
+
+_decode_json = json.JSONDecoder().decode
+
+
+def _gen_jsonl_blocks(f, chunk_size):
+    '''generate (decode, lines) for blocks of complete lines of the file
+
+    Lines of the block are decoded from UTF-8 at once and `decode` is the
+    JSON decoder for them. If block is not valid UTF-8 its lines are bytes
+    decoded by `json.loads` one by one.
+
+    '''
+    tail = []
+    while True:
+        block = f.read(chunk_size)
+        if block:
+            end = block.rfind(b'\n')
+            if end < 0:
+                tail.append(block)
+                continue
+            tail.append(block[:end])
+            data = b''.join(tail)
+            tail = [block[end + 1:]]
+        else:
+            data = b''.join(tail)
+
+        try:
+            yield _decode_json, data.decode('utf-8').split('\n')
+        except UnicodeDecodeError:
+            yield json.loads, data.split(b'\n')
+
+        if not block:
+            return
+
+
+def _get_async_fields(record_type):
+    '''get names of the record fields with asynchronous operations'''
+    res = vars(record_type).get('_async_fields')
+    if res is None:
+        res = record_type._async_fields = tuple(
+            name for name, op in record_type._fields.items()
+            if is_async_operation(op)
+        )
+    return res
+
+
+async def _gen_async_items(iterable):
+    '''iterate (async) iterable closing its iterator when closed'''
+    if hasattr(iterable, '__aiter__'):
+        items = iterable.__aiter__()
+        try:
+            async for item in items:
+                yield item
+        finally:
+            aclose = getattr(items, 'aclose', None)
+            if aclose is not None:
+                await aclose()
+    else:
+        items = iter(iterable)
+        try:
+            for item in items:
+                yield item
+        finally:
+            close = getattr(items, 'close', None)
+            if close is not None:
+                close()
+
+
+RowError = collections.namedtuple('RowError', 'index error')
+BatchResult = collections.namedtuple('BatchResult', 'records errors')
+
+
 class Factory(SimpleConversion):
     '''Wraps record construction
 
@@ -230,6 +1041,7 @@ class Factory(SimpleConversion):
     '''
     def __init__(self, record_type):
         self._record_type = record_type
+        self._interned = None
         def convert(v):
             return self(v)
         super().__init__(convert)
@@ -237,6 +1049,337 @@ class Factory(SimpleConversion):
     def __call__(self, *args, **kwargs):
         return self._record_type(*args, **kwargs)
 
+    def from_state(self, state: tuple, extra=None, trusted=False):
+        '''construct record from the state returned by `RecordBase.get_state()`
+
+        Trusted state is restored directly w/o validation. Otherwise fields
+        (and `extra` mapping for the extensible record) are validated as the
+        regular constructor input.
+
+        '''
+        record_type = self._record_type
+        if trusted:
+            return record_type._from_state(state, extra)
+        values = {
+            k: v for k, v in zip(record_type._fields, state) if v is not None
+        }
+        return record_type({**extra, **values} if extra else values)
+
+    def interned(self, *args, **kwargs):
+        '''construct record or return the equal record interned before
+
+        Pool of interned records keeps weak references, so a record is
+        removed from it when it is not used anymore. Field values should be
+        hashable.
+
+        '''
+        record = self._record_type(*args, **kwargs)
+        pool = self._interned
+        if pool is None:
+            pool = self._interned = weakref.WeakValueDictionary()
+        extra = getattr(record, '__dict__', None)
+        key = (record._get_state(record), frozenset(extra.items()) if extra else None)
+        return pool.setdefault(key, record)
+
+    def collect(self, values, max_errors=100):
+        '''construct record validating all fields, see `RecordBase.collect()`'''
+        return _collect(self._record_type, values, max_errors)
+
+    def build_many(self, iterable, on_error='raise') -> BatchResult:
+        '''construct records from the iterable of input mappings
+
+        Error policy `on_error` is one of:
+
+        - 'raise' - propagate the first RecordError with the input index
+          added as `row`;
+
+        - 'skip' - drop invalid inputs;
+
+        - 'collect' - drop invalid inputs and report them as RowError(index,
+          error) items of the result `errors` list.
+
+        '''
+        create = self._record_type
+        if on_error == 'raise':
+            records = []
+            add_record = records.append
+            for i, values in enumerate(iterable):
+                try:
+                    add_record(create(values))
+                except RecordError as err:
+                    err.args = ({**err.args[0], 'row': i},)
+                    raise
+            return BatchResult(records, [])
+
+        if on_error == 'skip':
+            records = list(self.stream(iterable, on_error='skip'))
+            return BatchResult(records, [])
+
+        if on_error != 'collect':
+            raise ValueError("Unknown error policy: {}".format(on_error))
+
+        records = []
+        errors = []
+        add_record = records.append
+        add_error = errors.append
+        for i, values in enumerate(iterable):
+            try:
+                add_record(create(values))
+            except RecordError as err:
+                add_error(RowError(i, err))
+        return BatchResult(records, errors)
+
+    def stream(self, iterable, on_error='raise', max_errors=None):
+        '''lazily construct records from the iterable of input mappings
+
+        Error policy `on_error` is one of:
+
+        - 'raise' - propagate the first RecordError;
+
+        - 'skip' - drop invalid inputs;
+
+        - dead-letter callable fn(index, values, err) called for each invalid
+          input.
+
+        Skipped and dead-letter inputs are validated w/o wrapping errors into
+        RecordError, so `err` is the original exception of the field operation
+        or hook and it is created only if dead-letter callable is used. If
+        `max_errors` is set, ErrorLimitError is raised when there are more
+        invalid inputs.
+
+        '''
+        record_type = self._record_type
+        if on_error == 'raise':
+            return map(record_type, iterable)
+
+        if on_error == 'skip':
+            dead_letter = None
+        elif callable(on_error):
+            dead_letter = on_error
+        else:
+            raise ValueError("Unknown error policy: {}".format(on_error))
+
+        return self._gen_stream(
+            record_type._try_create or _get_generic_try_create(record_type),
+            iterable, dead_letter, max_errors
+        )
+
+    def _gen_stream(self, try_create, iterable, dead_letter, max_errors):
+        error_count = 0
+        for i, values in enumerate(iterable):
+            record = try_create(values)
+            if record.__class__ is Failure:
+                error_count += 1
+                if dead_letter:
+                    dead_letter(i, values, record.error)
+                if max_errors is not None and error_count > max_errors:
+                    raise ErrorLimitError(
+                        self._record_type.__name__, 'too many errors',
+                        count=error_count
+                    ) from record.error
+                continue
+            yield record
+
+    def from_jsonl(self, file_or_path, chunk_size=1 << 20, on_error='raise', max_errors=None):
+        '''lazily construct records from JSON Lines file
+
+        File (path or binary file object) is read by `chunk_size` blocks.
+        Each non-empty line is decoded and the record is constructed from it.
+
+        Error policy `on_error` is the same as for `stream()` but dead-letter
+        callable is called as fn(line_number, line, err). If it is 'raise',
+        RecordError with the `line` number is raised from the decoding or
+        the record construction error. Line numbers start from 1.
+
+        '''
+        if on_error in ('raise', 'skip'):
+            dead_letter = None
+        elif callable(on_error):
+            dead_letter = on_error
+        else:
+            raise ValueError("Unknown error policy: {}".format(on_error))
+
+        return self._gen_from_jsonl(
+            file_or_path, chunk_size, on_error == 'raise', dead_letter, max_errors
+        )
+
+    def _gen_from_jsonl(self, file_or_path, chunk_size, is_raising, dead_letter, max_errors):
+        record_type = self._record_type
+        try_create = record_type._try_create or _get_generic_try_create(record_type)
+        is_path = isinstance(file_or_path, (str, bytes, os.PathLike))
+        f = open(file_or_path, 'rb') if is_path else file_or_path
+        line_number = 0
+        error_count = 0
+        try:
+            for decode, lines in _gen_jsonl_blocks(f, chunk_size):
+                if is_raising:
+                    try:
+                        records = [record_type(decode(line)) for line in lines if line]
+                    except Exception:
+                        records = None
+                    if records is not None:
+                        line_number += len(lines)
+                        yield from records
+                        continue
+
+                for line in lines:
+                    line_number += 1
+                    if not line.strip():
+                        continue
+
+                    if is_raising:
+                        try:
+                            record = record_type(decode(line))
+                        except Exception as err:
+                            raise RecordError(
+                                record_type.__name__, 'jsonl', line=line_number
+                            ) from err
+                        yield record
+                        continue
+
+                    try:
+                        values = decode(line)
+                    except ValueError as err:
+                        record = Failure.from_error(err)
+                    else:
+                        record = try_create(values)
+                    if record.__class__ is not Failure:
+                        yield record
+                        continue
+
+                    error_count += 1
+                    if dead_letter:
+                        dead_letter(line_number, line, record.error)
+                    if max_errors is not None and error_count > max_errors:
+                        raise ErrorLimitError(
+                            record_type.__name__, 'too many errors',
+                            count=error_count, line=line_number
+                        ) from record.error
+        finally:
+            if is_path:
+                f.close()
+
+    async def acreate(self, values=None, **overrides):
+        '''construct record applying asynchronous field operations concurrently
+
+        Synchronous fields are prepared first, so invalid input fails w/o
+        waiting for asynchronous operations. Then all asynchronous operations
+        (see `aprepare_field()`) are run by `asyncio.gather()` and the error of
+        the first failed field is raised as by the constructor.
+
+        '''
+        record_type = self._record_type
+        async_fields = _get_async_fields(record_type)
+        if not async_fields:
+            return record_type(values, **overrides)
+        if record_type._try_create is None:
+            raise TypeError(
+                "Asynchronous fields are supported only by standard records"
+            )
+
+        if not values:
+            values = overrides
+        elif overrides:
+            values = {**values, **overrides}
+
+        cls_name = record_type.__name__
+        fields = record_type._fields
+        state = dict.fromkeys(fields)
+        try:
+            for name, prepare in record_type._preparers.items():
+                if name in async_fields:
+                    continue
+                try:
+                    state[name] = prepare(name, values)
+                except FieldError:
+                    raise
+                except Exception as err:
+                    raise InvalidFieldError(name, "input") from err
+        except Exception as err:
+            raise RecordError(cls_name, "init") from err
+
+        results = await asyncio.gather(
+            *(aprepare_field(fields[name], name, values) for name in async_fields),
+            return_exceptions=True
+        )
+        for name, res in zip(async_fields, results):
+            if isinstance(res, Exception):
+                try:
+                    if isinstance(res, FieldError):
+                        raise res
+                    raise InvalidFieldError(name, "input") from res
+                except Exception as err:
+                    raise RecordError(cls_name, "init") from err
+            state[name] = res
+
+        extra = None
+        if issubclass(record_type, ExtensibleRecord):
+            extra = {k: values[k] for k in values.keys() - fields.keys()}
+        return _create_from_state(record_type, tuple(state.values()), extra)
+
+    def astream(self, iterable, concurrency=16, on_error='raise', max_errors=None):
+        '''asynchronously construct records from the (async) iterable of inputs
+
+        Up to `concurrency` records are constructed by `acreate()`
+        concurrently, records are generated in the input order. Error policy
+        is the same as for `stream()`.
+
+        '''
+        if on_error in ('raise', 'skip'):
+            dead_letter = None
+        elif callable(on_error):
+            dead_letter = on_error
+        else:
+            raise ValueError("Unknown error policy: {}".format(on_error))
+
+        return self._agen_stream(
+            iterable, concurrency, on_error == 'raise', dead_letter, max_errors
+        )
+
+    async def _agen_stream(self, iterable, concurrency, is_raising, dead_letter, max_errors):
+        items = _gen_async_items(iterable)
+        pending = collections.deque()
+        index = 0
+        error_count = 0
+        is_exhausted = False
+        try:
+            while True:
+                while not is_exhausted and len(pending) < concurrency:
+                    try:
+                        values = await items.__anext__()
+                    except StopAsyncIteration:
+                        is_exhausted = True
+                        break
+                    task = asyncio.ensure_future(self.acreate(values))
+                    pending.append((index, values, task))
+                    index += 1
+
+                if not pending:
+                    return
+
+                i, values, task = pending.popleft()
+                try:
+                    record = await task
+                except Exception as err:
+                    if is_raising:
+                        raise
+                    error_count += 1
+                    if dead_letter:
+                        dead_letter(i, values, err)
+                    if max_errors is not None and error_count > max_errors:
+                        raise ErrorLimitError(
+                            self._record_type.__name__, 'too many errors',
+                            count=error_count
+                        ) from err
+                    continue
+                yield record
+        finally:
+            tasks = [task for _, _, task in pending]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await items.aclose()
+
     def __or__(self, other):
         return convert(self) | other
 
@@ -252,6 +1395,94 @@ class Factory(SimpleConversion):
         return self._record_type.__name__
 
 
+@compile_value_conversion.register(Factory)
+def compile_factory(op):
+    return compile_simple_conversion(op, op.record_type)
+
+
+@compile_try_value_conversion.register(Factory)
+def compile_try_factory(op):
+    return compile_try_simple_conversion(op, op.record_type)
+
+
+# types of values which can't be used as the record input mapping
+_non_mapping_types = (
+    int, float, complex, str, bytes, list, tuple, set, frozenset, type(None)
+)
+
+
+def _requires_input(record_type):
+    '''check if the record can't be created from the empty input'''
+    res = record_type.get_factory().try_prepare_field('value', {'value': {}})
+    return type(res) is Failure
+
+
+def _excludes_record_input(op, other):
+    '''check if the type or value check can't pass for the record input
+
+    Record is created only from the mapping or, if all fields are optional,
+    from any false value.
+
+    '''
+    if not _owns_prepare_field(other, SimpleConversion):
+        return False
+    if hasattr(other, '_expected'):
+        expected = other._expected
+        if not isinstance(expected, _non_mapping_types):
+            return False
+        return bool(expected) or _requires_input(op.record_type)
+
+    types = getattr(other, '_expected_types', None)
+    if not types or not all(issubclass(t, _non_mapping_types) for t in types):
+        return False
+    return _requires_input(op.record_type)
+
+
+@excludes.register(Factory)
+def factory_excludes(op, other):
+    '''records exclude each other if they expect different discriminant values
+
+    Record also excludes checks of the types (or values) which can't be the
+    record input, see `_excludes_record_input`.
+
+    '''
+    if not isinstance(other, Factory):
+        return (
+            isinstance(other, SimpleConversion)
+            and _excludes_record_input(op, other)
+        )
+
+    contract = op.record_type.get_contract()
+    other_contract = other.record_type.get_contract()
+    for name in contract.keys() & other_contract.keys():
+        values = [v for v, _ in _gen_discriminants(contract[name])]
+        other_values = [v for v, _ in _gen_discriminants(other_contract[name])]
+        if values and other_values and not any(
+                v is x or v == x for v in values for x in other_values
+        ):
+            return True
+    return False
+
+
+@is_async_operation.register(Factory)
+def is_async_factory(op):
+    return bool(_get_async_fields(op.record_type))
+
+
+@aprepare_field.register(Factory)
+async def aprepare_factory_field(op, field_name, values):
+    try:
+        input_data = values[field_name]
+    except KeyError as err:
+        raise MissingFieldError(field_name) from err
+    return await op.acreate(input_data)
+
+
+@get_result_type.register(Factory)
+def get_factory_result_type(op):
+    return op.record_type
+
+
 class Record(RecordBase, metaclass=RecordMeta):
     __slots__ = tuple()
 
@@ -298,24 +1529,192 @@ class ExtensibleRecord(RecordBase, metaclass=RecordMeta):
         yield from self.__dict__.keys()
 
 
+class LazyRecord(RecordBase, metaclass=RecordMeta):
+    '''Record converting fields on the first access
+
+    Record keeps the reference to the input mapping until all fields are
+    converted. Field conversion errors are raised on the field access:
+    MissingFieldError and InvalidFieldError of the field operation are
+    propagated as is, other exceptions are wrapped into InvalidFieldError.
+
+    Fields forced by hooks (see `mark_hook`) are converted on construction.
+
+    '''
+
+    __slots__ = tuple()
+    _service_fields = ('_initialized', '_hash', '_input')
+
+    def _initialize(self, values):
+        object.__setattr__(self, '_input', values)
+        for name in self.get_forced_fields():
+            getattr(self, name)
+
+    @classmethod
+    def get_forced_fields(cls) -> tuple:
+        '''get names of fields converted on construction to run hooks'''
+        res = vars(cls).get('_forced_fields')
+        if res is None:
+            hooks = itertools.chain(
+                getattr(cls, Target.Init.value, []),
+                getattr(cls, Target.PostInit.value, [])
+            )
+            names = {
+                name for hook in hooks for name in getattr(hook, 'hook_forces', ())
+            }
+            res = cls._forced_fields = tuple(n for n in cls._fields if n in names)
+        return res
+
+    def validate_all(self):
+        '''convert all not yet converted fields and release the input'''
+        for name in self._fields:
+            getattr(self, name)
+        try:
+            object.__delattr__(self, '_input')
+        except AttributeError:
+            pass
+        return self
+
+    def __getattr__(self, name):
+        prepare = self._preparers.get(name)
+        if prepare is None:
+            raise AttributeError(name)
+        try:
+            values = object.__getattribute__(self, '_input')
+        except AttributeError:
+            return None
+
+        try:
+            res = prepare(name, values)
+        except (FieldError, MissingFieldError, InvalidFieldError):
+            raise
+        except Exception as err:
+            raise InvalidFieldError(name, 'input') from err
+        object.__setattr__(self, name, res)
+        return res
+
+    def __setattr__(self, name, value):
+        if name != '_initialized' and self._initialized:
+            raise AccessError(name)
+        super().__setattr__(name, value)
+
+    def gen_names(self):
+        yield from self.gen_record_names()
+
+    def __len__(self):
+        return len(self._fields)
+
+
+class RecordView(collections.Mapping):
+    '''Read-only view of the input mapping checked by the record contract
+
+    Field values are converted by the record field operations on each access
+    or, if `cache` is set, on the first access. Hooks are not run. Conversion
+    errors are raised on access as by LazyRecord. View of the extensible
+    record also provides other keys of the input.
+
+    '''
+    __slots__ = ('_record_type', '_values', '_cache')
+
+    def __init__(self, record_type, values: collections.Mapping, cache=False):
+        self._record_type = record_type
+        self._values = values
+        self._cache = {} if cache else None
+
+    @property
+    def record_type(self):
+        return self._record_type
+
+    def _get_field(self, name, prepare):
+        cache = self._cache
+        if cache is not None and name in cache:
+            return cache[name]
+
+        try:
+            res = prepare(name, self._values)
+        except (FieldError, MissingFieldError, InvalidFieldError):
+            raise
+        except Exception as err:
+            raise InvalidFieldError(name, 'input') from err
+        if cache is not None:
+            cache[name] = res
+        return res
+
+    def _is_extra(self, name):
+        return issubclass(self._record_type, ExtensibleRecord) and name in self._values
+
+    def __getattr__(self, name):
+        prepare = self._record_type._preparers.get(name)
+        if prepare is not None:
+            return self._get_field(name, prepare)
+        if not name.startswith('_') and self._is_extra(name):
+            return self._values[name]
+        raise AttributeError(name)
+
+    def __getitem__(self, name):
+        prepare = self._record_type._preparers.get(name)
+        if prepare is not None:
+            return self._get_field(name, prepare)
+        if self._is_extra(name):
+            return self._values[name]
+        raise KeyError(name)
+
+    def __iter__(self):
+        fields = self._record_type._fields
+        yield from fields
+        if issubclass(self._record_type, ExtensibleRecord):
+            yield from (k for k in self._values if k not in fields)
+
+    def __len__(self):
+        fields = self._record_type._fields
+        if issubclass(self._record_type, ExtensibleRecord):
+            return len(fields) + len(self._values.keys() - fields.keys())
+        return len(fields)
+
+    def to_record(self):
+        '''construct record from the input mapping'''
+        return self._record_type(self._values)
+
+    def __repr__(self):
+        return '{}.view({!r})'.format(self._record_type.__name__, self._values)
+
+
+@as_basic_type.register(RecordView)
+def record_view_as_basic_type(v):
+    return {k: as_basic_type(x) for k, x in v.items()}
+
+
 @as_basic_type.register(RecordBase)
 def record_as_basic_type(s):
-    return {k: as_basic_type(v) for k, v in s.gen_fields()}
+    serialize = _get_record_serializer(s.__class__)
+    if serialize is None:
+        return {k: as_basic_type(v) for k, v in s.gen_fields()}
+    return serialize(s)
+
+
+def _get_caller_module():
+    '''get name of the module calling the record factory function'''
+    try:
+        return sys._getframe(2).f_globals.get('__name__', '__main__')
+    except (AttributeError, ValueError):
+        return __name__
 
 
 def record_factory(cls_name, **fields):
-    return RecordMeta(cls_name, (Record,), fields).get_factory()
+    namespace = dict(fields, __module__=_get_caller_module())
+    return RecordMeta(cls_name, (Record,), namespace).get_factory()
 
 
 def extensible_record_factory(cls_name, **fields):
-    return RecordMeta(cls_name, (ExtensibleRecord,), fields).get_factory()
+    namespace = dict(fields, __module__=_get_caller_module())
+    return RecordMeta(cls_name, (ExtensibleRecord,), namespace).get_factory()
 
 
 def extended_record(cls_name, bases, **fields):
     assert isinstance(bases, tuple)
     assert len(bases) > 0
     assert issubclass(bases[0], RecordBase)
-    return RecordMeta(cls_name, bases, fields).get_factory()
+    namespace = dict(fields, __module__=_get_caller_module())
+    return RecordMeta(cls_name, bases, namespace).get_factory()
 
 
 def subrecord(record_type):
@@ -0,0 +1,316 @@
+import collections
+import mmap
+import os
+import struct
+
+from .error import (
+    AccessError,
+    DecodeError,
+)
+from .operation import (
+    as_basic_type,
+    get_result_type,
+    get_tag_indexes,
+    Tag,
+)
+from .record import (
+    ExtensibleRecord,
+    Record,
+)
+
+
+_MAGIC = b'CORS'
+_header = struct.Struct('<4s8sIQ')
+
+_scalar_formats = {
+    int: 'q',
+    float: 'd',
+    bool: '?',
+}
+
+
+def _get_tag_format(tag_type):
+    size = len(tag_type)
+    return 'B' if size <= 0x100 else 'H' if size <= 0x10000 else 'I'
+
+
+def _get_field_layout(record_type, name):
+    '''get (struct format, encode, decode) for the field
+
+    Encode and decode are None for scalars packed as is.
+
+    '''
+    op = record_type._fields[name]
+    result_type = get_result_type(op)
+    if result_type in _scalar_formats:
+        return _scalar_formats[result_type], None, None
+
+    if isinstance(result_type, type) and issubclass(result_type, Tag):
+        indexes, members = get_tag_indexes(result_type)
+        return _get_tag_format(result_type), indexes.__getitem__, members.__getitem__
+
+    raise TypeError(
+        "Field {}.{} has no fixed size type: {}".format(
+            record_type.__name__, name, op.info
+        )
+    )
+
+
+class _Layout:
+    '''Fixed-width row layout: presence bitmap followed by field values'''
+
+    def __init__(self, record_type):
+        if not issubclass(record_type, Record) or issubclass(record_type, ExtensibleRecord):
+            raise TypeError('Only Record fields can be stored')
+
+        names = tuple(record_type._fields)
+        layouts = [_get_field_layout(record_type, name) for name in names]
+        self.indexes = {name: i for i, name in enumerate(names)}
+        self.bitmap_size = (len(names) + 7) // 8
+        self.row = struct.Struct('<{}s{}'.format(
+            self.bitmap_size, ''.join(fmt for fmt, _, _ in layouts)
+        ))
+        self.fields = [struct.Struct('<' + fmt) for fmt, _, _ in layouts]
+        self.offsets = [
+            self.bitmap_size + struct.calcsize('<' + ''.join(
+                fmt for fmt, _, _ in layouts[:i]
+            ))
+            for i in range(len(layouts))
+        ]
+        self.encoders = [encode for _, encode, _ in layouts]
+        self.decoders = [decode for _, _, decode in layouts]
+        self.defaults = [fmt.unpack(bytes(fmt.size))[0] for fmt in self.fields]
+
+    def pack_into(self, buffer, offset, state):
+        bitmap = bytearray(self.bitmap_size)
+        values = []
+        for i, (v, encode) in enumerate(zip(state, self.encoders)):
+            if v is None:
+                values.append(self.defaults[i])
+                continue
+            bitmap[i >> 3] |= 1 << (i & 7)
+            values.append(v if encode is None else encode(v))
+        self.row.pack_into(buffer, offset, bytes(bitmap), *values)
+
+    def decode(self, values):
+        bitmap = values[0]
+        return tuple(
+            None if not bitmap[i >> 3] & (1 << (i & 7))
+            else v if decode is None else decode(v)
+            for i, (v, decode) in enumerate(zip(values[1:], self.decoders))
+        )
+
+
+class StoreRow(collections.Mapping):
+    '''Lazily decoded view of the RecordStore row'''
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store, index):
+        self._store = store
+        self._index = index
+
+    def __getattr__(self, name):
+        try:
+            return self._store._get_field(self._index, name)
+        except KeyError as err:
+            raise AttributeError(name) from err
+
+    def __getitem__(self, name):
+        return self._store._get_field(self._index, name)
+
+    def __iter__(self):
+        return iter(self._store.record_type._fields)
+
+    def __len__(self):
+        return len(self._store.record_type._fields)
+
+    @property
+    def index(self):
+        return self._index
+
+    def to_record(self):
+        return self._store.record_type._from_state(self._store._get_state(self._index))
+
+    def __repr__(self):
+        return '{}[{}]({})'.format(
+            self._store.record_type.__name__, self._index, dict(self.items())
+        )
+
+
+@as_basic_type.register(StoreRow)
+def store_row_as_basic_type(v):
+    return {k: as_basic_type(x) for k, x in v.items()}
+
+
+class RecordStore(collections.Sequence):
+    '''Memory-mapped file of fixed-width rows of the Record
+
+    All record fields should have int, float, bool or Tag result type (see
+    `get_result_type`). Rows are accessed by index w/o reading the whole file
+    and decoded lazily. The file header contains the record schema
+    fingerprint checked on open, it covers the order of fields and Tag
+    members stored as indexes.
+
+    Appending can move the mapping, so it fails with BufferError while
+    memoryviews returned by `scan()` are alive.
+
+    '''
+
+    def __init__(self, record_type, path, readonly=False):
+        self._record_type = record_type
+        self._layout = _Layout(record_type)
+        self._readonly = readonly
+        self._file = open(path, 'rb' if readonly else 'r+b')
+        try:
+            self._mmap = mmap.mmap(
+                self._file.fileno(), 0,
+                access=mmap.ACCESS_READ if readonly else mmap.ACCESS_WRITE
+            )
+            self._count = self._read_header()
+        except Exception:
+            self._file.close()
+            raise
+
+    @classmethod
+    def create(cls, record_type, path, capacity=1024):
+        '''create empty store file'''
+        layout = _Layout(record_type)
+        with open(path, 'wb') as f:
+            f.write(_header.pack(
+                _MAGIC, bytes.fromhex(record_type._schema_fingerprint),
+                layout.row.size, 0
+            ))
+            f.truncate(_header.size + layout.row.size * max(capacity, 1))
+        return cls(record_type, path)
+
+    @classmethod
+    def open(cls, record_type, path, readonly=False):
+        return cls(record_type, path, readonly)
+
+    def _read_header(self):
+        record_type = self._record_type
+        try:
+            magic, fingerprint, row_size, count = _header.unpack_from(self._mmap)
+        except struct.error as err:
+            raise DecodeError(record_type.__name__, 'Not a record store') from err
+        if magic != _MAGIC:
+            raise DecodeError(record_type.__name__, 'Not a record store')
+        if (fingerprint.hex() != record_type._schema_fingerprint
+                or row_size != self._layout.row.size):
+            raise DecodeError(
+                record_type.__name__, 'Schema mismatch', fingerprint=fingerprint.hex()
+            )
+        return count
+
+    @property
+    def record_type(self):
+        return self._record_type
+
+    def _get_offset(self, index):
+        return _header.size + index * self._layout.row.size
+
+    def _check_index(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return index
+
+    def _get_field(self, index, name):
+        layout = self._layout
+        i = layout.indexes[name]
+        offset = self._get_offset(index)
+        if not self._mmap[offset + (i >> 3)] & (1 << (i & 7)):
+            return None
+        v, = layout.fields[i].unpack_from(self._mmap, offset + layout.offsets[i])
+        decode = layout.decoders[i]
+        return v if decode is None else decode(v)
+
+    def _get_state(self, index):
+        return self._layout.decode(
+            self._layout.row.unpack_from(self._mmap, self._get_offset(index))
+        )
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [StoreRow(self, i) for i in range(*index.indices(self._count))]
+        return StoreRow(self, self._check_index(index))
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield StoreRow(self, i)
+
+    def scan(self, start=0, stop=None) -> memoryview:
+        '''get memoryview of packed rows w/o copying'''
+        start, stop, _ = slice(start, stop).indices(self._count)
+        return memoryview(self._mmap)[self._get_offset(start):self._get_offset(max(start, stop))]
+
+    def iter_states(self, start=0, stop=None):
+        '''iterate over tuples of row field values'''
+        decode = self._layout.decode
+        view = self.scan(start, stop)
+        try:
+            for values in self._layout.row.iter_unpack(view):
+                yield decode(values)
+        finally:
+            view.release()
+
+    def iter_records(self, start=0, stop=None):
+        from_state = self._record_type._from_state
+        for state in self.iter_states(start, stop):
+            yield from_state(state)
+
+    def _reserve(self, count):
+        required = self._get_offset(count)
+        size = len(self._mmap)
+        if required > size:
+            self._mmap.resize(max(required, size * 2))
+
+    def append(self, record):
+        '''append record (or mapping validated by the record contract)'''
+        self.extend((record,))
+
+    def extend(self, records):
+        if self._readonly:
+            raise AccessError('Store is opened read-only')
+        record_type = self._record_type
+        get_state = record_type._get_state
+        pack_into = self._layout.pack_into
+        count = self._count
+        try:
+            for record in records:
+                if not isinstance(record, record_type):
+                    record = record_type(record)
+                self._reserve(count + 1)
+                pack_into(self._mmap, self._get_offset(count), get_state(record))
+                count += 1
+        finally:
+            self._count = count
+            _header.pack_into(
+                self._mmap, 0, _MAGIC,
+                bytes.fromhex(record_type._schema_fingerprint),
+                self._layout.row.size, count
+            )
+
+    def flush(self):
+        if not self._readonly:
+            self._mmap.flush()
+
+    def close(self):
+        if self._mmap.closed:
+            return
+        self.flush()
+        self._mmap.close()
+        if not self._readonly:
+            os.ftruncate(self._file.fileno(), self._get_offset(self._count))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
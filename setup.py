@@ -20,7 +20,7 @@ setup(
         'Programming Language :: Python :: 3.6',
     ],
     keywords="adt contract types development",
-    packages=find_packages(exclude=['tests', 'examples']),
+    packages=find_packages(exclude=['tests', 'examples', 'benchmarks']),
     test_suite='tests',
     setup_requires=['pytest-runner'],
     tests_require=['pytest'],
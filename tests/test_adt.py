@@ -1,18 +1,25 @@
 from collections import namedtuple
+import copy
 from enum import Enum
 from functools import partial
+import io
+import json
+import pickle
 import types
 
 import pytest
 
 from cor.adt.error import (
     AccessError,
+    AggregateError,
+    ErrorLimitError,
     InvalidFieldError,
     MissingFieldError,
     RecordError,
 )
 from cor.adt.hook import (
     HooksFactory,
+    field_aggregate,
     field_invariant,
     Target,
 )
@@ -20,19 +27,27 @@ from cor.adt.record import (
     as_basic_type,
     ExtensibleRecord,
     Factory,
+    LazyRecord,
     Record,
     RecordMixin,
+    RecordView,
     subrecord,
     record_factory,
+    to_json,
 )
 from cor.adt.operation import (
+    adaptive,
     anything,
+    choose_by_field,
+    compile_operation,
+    compile_try_operation,
     ContractInfo,
     convert,
     default_conversion,
     expect_type,
     expect_types,
     get_contract_info,
+    memoized,
     not_empty,
     only_if,
     provide_missing,
@@ -43,6 +58,7 @@ from cor.adt.operation import (
 )
 
 from cor.util import split_args
+import cor.adt.operation as operation
 
 
 class Input(Enum):
@@ -594,3 +610,829 @@ def test_record_mixin():
     b = B(a)
 
     pytest.raises(RecordError, B, c='car')
+
+
+def test_generated_init():
+    class Foo(Record):
+        id = expect_type(int)
+        name = skip_missing >> convert(str)
+
+    assert getattr(Foo.__init__, '_is_generated', False)
+    foo = Foo({'id': 1}, name=2)
+    assert as_basic_type(foo) == {'id': 1, 'name': '2'}
+    assert as_basic_type(Foo(id=1)) == {'id': 1, 'name': None}
+    pytest.raises(RecordError, Foo, id='1')
+    pytest.raises(AccessError, setattr, foo, 'id', 2)
+
+    class Bar(Foo):
+        def _initialize(self, values):
+            super()._initialize({**values, 'name': 'bar'})
+
+    assert not getattr(Bar.__init__, '_is_generated', False)
+    assert Bar(id=1).name == 'bar'
+
+    class Baz(Foo):
+        def __init__(self, id):
+            super().__init__(id=id, name='baz')
+
+    assert Baz(3) == {'id': 3, 'name': 'baz'}
+
+    class Qux(Baz):
+        pass
+
+    assert Qux._try_create is None
+    assert not getattr(Qux.__init__, '_is_generated', False)
+    assert Qux(4) == {'id': 4, 'name': 'baz'}
+
+    class Wheels(ExtensibleRecord):
+        wheels = expect_type(int)
+
+    wheels = Wheels(wheels=4, doors=2)
+    assert as_basic_type(wheels) == {'wheels': 4, 'doors': 2}
+
+
+def _get_prepare_field_result(prepare, name, values):
+    try:
+        return prepare(name, values)
+    except Exception as err:
+        cause = err.__cause__
+        return (
+            type(err), err.args,
+            type(cause), cause.args if cause is not None else None
+        )
+
+
+def test_compile_operation():
+    data = (
+        (expect_type(int), [{'foo': 1}, {'foo': '1'}, {}, None]),
+        (convert(int) >> convert(str) >> convert(float), [{'foo': '1'}, {'foo': 's'}, {}]),
+        (skip_missing >> convert(int), [{'foo': '1'}, {}, {'foo': 's'}]),
+        (provide_missing(42) >> convert(int), [{}, {'foo': '1'}, {'foo': 's'}]),
+        (expect_type(int) | expect_type(str), [{'foo': 1}, {'foo': 's'}, {'foo': 1.1}]),
+        (provide_missing(None) | convert(int), [{}, {'foo': '2'}, {'foo': 's'}]),
+        (operation.Pipe(something, convert(int)), [{'foo': '1'}, {}]),
+        (operation.Or(anything, convert(int)), [{'foo': '1'}, {}]),
+        (should_be(WheelerType.Car), [{'foo': WheelerType.Car}, {'foo': 'car'}]),
+        (convert(WheelerType) >> should_be(WheelerType.Car), [{'foo': 'car'}, {'foo': 'truck'}]),
+    )
+    for conversion, inputs in data:
+        prepare = compile_operation(conversion)
+        assert prepare != conversion.prepare_field
+        for values in inputs:
+            expected = _get_prepare_field_result(conversion.prepare_field, 'foo', values)
+            res = _get_prepare_field_result(prepare, 'foo', values)
+            assert res == expected, (conversion, values)
+
+
+def test_compile_operation_dedup():
+    calls = []
+
+    def count_calls(v):
+        calls.append(v)
+        return v
+
+    conversion = expect_type(int) >> expect_type(int) >> convert(count_calls)
+    steps = list(operation._gen_deduplicated_steps(operation._gen_pipe_steps(conversion)))
+    assert len(steps) == 2
+    assert compile_operation(conversion)('foo', {'foo': 1}) == 1
+    assert calls == [1]
+
+    conversion = expect_type(int) >> convert(str) >> expect_type(int)
+    steps = list(operation._gen_deduplicated_steps(operation._gen_pipe_steps(conversion)))
+    assert len(steps) == 3
+    pytest.raises(InvalidFieldError, compile_operation(conversion), 'foo', {'foo': 1})
+
+    class Custom(operation.Operation):
+        info = 'custom'
+
+        def prepare_field(self, name, values):
+            return values.get('other')
+
+    conversion = convert(int) >> Custom()
+    assert compile_operation(conversion) == conversion.prepare_field
+
+
+def test_build_many():
+    class Foo(Record):
+        id = expect_type(int)
+
+    factory = Foo.get_factory()
+    inputs = [{'id': 1}, {'id': '2'}, {'id': 3}, {}]
+
+    res = factory.build_many(inputs[::2])
+    assert res.records == [Foo(id=1), Foo(id=3)]
+    assert res.errors == []
+
+    with pytest.raises(RecordError) as err_info:
+        factory.build_many(iter(inputs))
+    assert err_info.value.args[0]['row'] == 1
+    assert isinstance(err_info.value.__cause__, InvalidFieldError)
+
+    res = factory.build_many(iter(inputs), on_error='skip')
+    assert res.records == [Foo(id=1), Foo(id=3)]
+    assert res.errors == []
+
+    res = factory.build_many(inputs, on_error='collect')
+    assert res.records == [Foo(id=1), Foo(id=3)]
+    assert [e.index for e in res.errors] == [1, 3]
+    assert all(isinstance(e.error, RecordError) for e in res.errors)
+
+    pytest.raises(ValueError, factory.build_many, inputs, on_error='ignore')
+
+
+def test_stream():
+    class Foo(Record):
+        id = expect_type(int)
+
+    factory = Foo.get_factory()
+    inputs = [{'id': 1}, {'id': '2'}, {'id': 3}, {}]
+
+    res = factory.stream(iter(inputs[::2]))
+    assert not isinstance(res, list)
+    assert list(res) == [Foo(id=1), Foo(id=3)]
+
+    pytest.raises(RecordError, list, factory.stream(inputs))
+    assert list(factory.stream(inputs, on_error='skip')) == [Foo(id=1), Foo(id=3)]
+
+    dead_letters = []
+    res = factory.stream(inputs, on_error=lambda *args: dead_letters.append(args))
+    assert [r.id for r in res] == [1, 3]
+    assert [(i, v) for i, v, _ in dead_letters] == [(1, {'id': '2'}), (3, {})]
+    assert isinstance(dead_letters[0][2], InvalidFieldError)
+    assert isinstance(dead_letters[1][2], MissingFieldError)
+
+    res = factory.stream(inputs, on_error='skip', max_errors=1)
+    assert next(res) == Foo(id=1)
+    assert next(res) == Foo(id=3)
+    pytest.raises(ErrorLimitError, next, res)
+
+    doubled = (r.id * 2 for r in factory.stream(inputs, on_error='skip'))
+    assert list(doubled) == [2, 6]
+
+    pytest.raises(ValueError, factory.stream, inputs, on_error='ignore')
+
+    initialized = []
+
+    class Bar(Foo):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            initialized.append(self.id)
+
+    res = list(Bar.get_factory().stream(inputs, on_error='skip'))
+    assert [type(r) for r in res] == [Bar, Bar]
+    assert initialized == [1, 3]
+
+
+class Label(Record):
+    text = convert(str)
+    color = anything
+
+
+class Tagged(ExtensibleRecord):
+    label = Label.get_factory()
+
+
+def test_pickle_record():
+    label = Label(text=1, color='red')
+    data = pickle.dumps(label)
+    assert b'Label' in data
+    restored = pickle.loads(data)
+    assert type(restored) is Label
+    assert restored == label
+    assert label.get_state() == ('1', 'red')
+
+    tagged = Tagged(label={'text': 'x'}, size=2)
+    restored = pickle.loads(pickle.dumps(tagged))
+    assert restored == tagged
+    assert restored.size == 2
+    assert restored.label.color is None
+
+    factory = Label.get_factory()
+    assert factory.from_state(('1', 'red'), trusted=True) == label
+    assert factory.from_state((1, 'red')) == label
+    assert factory.from_state((1, 'red'), trusted=True) != label
+
+
+def test_copy_record():
+    tagged = Tagged(label={'text': 'x', 'color': ['red']}, size=[2])
+    assert copy.copy(tagged) is tagged
+
+    res = copy.deepcopy(tagged)
+    assert res is not tagged
+    assert res == tagged
+    assert res.label is not tagged.label
+    assert res.label.color is not tagged.label.color
+    assert res.size is not tagged.size
+    pytest.raises(Exception, setattr, res, 'size', 1)
+
+
+def test_choose_by_field():
+    class Kind(Tag):
+        Bicycle = 'bicycle'
+        Car = 'car'
+
+    class Bicycle(Record):
+        kind = convert(Kind) >> should_be(Kind.Bicycle)
+        breaks = expect_type(str)
+
+    class Car(Record):
+        kind = should_be(Kind.Car)
+        doors = expect_type(int)
+
+    class Owner(Record):
+        vehicle = choose_by_field('kind', [Bicycle.get_factory(), Car.get_factory()])
+
+    table = operation._get_dispatch_table('kind', [Bicycle.get_factory(), Car.get_factory()])
+    assert set(table) == {Kind.Bicycle, 'bicycle', Kind.Car}
+
+    owner = Owner(vehicle={'kind': 'bicycle', 'breaks': 'disk'})
+    assert isinstance(owner.vehicle, Bicycle)
+    owner = Owner(vehicle={'kind': Kind.Car, 'doors': 2})
+    assert isinstance(owner.vehicle, Car)
+    pytest.raises(RecordError, Owner, vehicle={'kind': 'car', 'doors': 2})
+    pytest.raises(RecordError, Owner, vehicle={'kind': Kind.Car, 'doors': '2'})
+    pytest.raises(RecordError, Owner, vehicle={'doors': 2})
+    pytest.raises(RecordError, Owner, vehicle={'kind': [], 'doors': 2})
+
+    class Any(Record):
+        kind = expect_type(str)
+
+    union = [Car.get_factory(), Any.get_factory()]
+    assert operation._get_dispatch_table('kind', union) is None
+
+    class Other(Record):
+        vehicle = choose_by_field('kind', union)
+
+    assert isinstance(Other(vehicle={'kind': Kind.Car, 'doors': 1}).vehicle, Car)
+    assert isinstance(Other(vehicle={'kind': 'car'}).vehicle, Any)
+
+
+def test_choose_by_field_many_variants():
+    Kind = Tag('Kind', [('V{}'.format(i), 'v{}'.format(i)) for i in range(60)])
+    factories = [
+        record_factory(
+            'V{}'.format(i),
+            kind=convert(Kind) >> should_be(Kind['V{}'.format(i)]),
+            value=expect_type(int),
+        )
+        for i in range(60)
+    ]
+    conversion = choose_by_field('kind', factories)
+    res = conversion.convert({'kind': 'v59', 'value': 1})
+    assert isinstance(res, factories[59].record_type)
+    assert res.kind is Kind.V59
+
+
+def _get_error_chain(err):
+    res = []
+    while err is not None:
+        res.append((type(err), err.args))
+        err = err.__cause__
+    return res
+
+
+def test_try_prepare_field():
+    created = []
+
+    class CountedError(ValueError):
+        def __init__(self, *args):
+            created.append(self)
+            super().__init__(*args)
+
+    conversion = (
+        only_if(lambda v: isinstance(v, int), 'int', CountedError)
+        | only_if(lambda v: isinstance(v, str), 'str', CountedError)
+        | convert(float)
+    )
+    prepare = compile_operation(conversion)
+    try_prepare = compile_try_operation(conversion)
+
+    for values in ({'foo': 1}, {'foo': 's'}, {'foo': '1.5'}):
+        expected = conversion.prepare_field('foo', values)
+        assert conversion.try_prepare_field('foo', values) == expected
+        assert try_prepare('foo', values) == expected
+        assert prepare('foo', values) == expected
+    assert created == []
+
+    for values in ({'foo': None}, {}):
+        with pytest.raises(Exception) as err_info:
+            conversion.prepare_field('foo', values)
+        expected = _get_error_chain(err_info.value)
+        for try_fn in (conversion.try_prepare_field, try_prepare):
+            failure = try_fn('foo', values)
+            assert isinstance(failure, operation.error.Failure)
+            assert _get_error_chain(failure.error) == expected
+        with pytest.raises(Exception) as err_info:
+            prepare('foo', values)
+        assert _get_error_chain(err_info.value) == expected
+
+    created.clear()
+    failure = try_prepare('foo', {'foo': None})
+    assert created == []
+    failure.error
+    assert len(created) == 2
+
+    conversion = convert(int) >> expect_type(int)
+    assert compile_try_operation(conversion)('foo', {'foo': '1'}) == 1
+    failure = compile_try_operation(conversion)('foo', {'foo': 's'})
+    assert isinstance(failure.error, InvalidFieldError)
+
+
+def test_lazy_error():
+    rendered = []
+
+    class Value:
+        def __repr__(self):
+            rendered.append(self)
+            return 'Value()'
+
+    value = Value()
+    conversion = only_if(lambda v: False, 'never')
+    with pytest.raises(InvalidFieldError) as err_info:
+        conversion.prepare_field('foo', {'foo': value})
+    err = err_info.value
+    assert rendered == []
+
+    cause = err.__cause__
+    assert isinstance(cause, ValueError)
+    args = err.args
+    assert len(rendered) == 1
+    assert args == ({'name': 'foo', 'info': repr(cause)},)
+    assert err.args is args
+    assert str(err) == str(err.args[0])
+    assert repr(err) == 'InvalidFieldError({!r})'.format(err.args[0])
+
+    err = RecordError('Foo', 'init', row=1)
+    assert err.args == ({'name': 'Foo', 'info': 'init', 'row': 1},)
+    restored = pickle.loads(pickle.dumps(err))
+    assert restored.args == err.args
+    assert str(restored) == str(err)
+
+    err = MissingFieldError('foo')
+    assert err.args == ({'name': 'foo', 'info': 'missing'},)
+    err.args = ('other',)
+    assert str(err) == 'other'
+
+
+def test_collect_errors():
+    class Kind(Tag):
+        Bicycle = 'bicycle'
+        Car = 'car'
+
+    class Bicycle(Record):
+        kind = should_be(Kind.Bicycle)
+        breaks = expect_type(str)
+
+    class Car(Record):
+        kind = should_be(Kind.Car)
+        doors = expect_type(int)
+
+    class Address(Record):
+        city = expect_type(str)
+        zip = convert(int)
+
+    class Person(Record):
+        name = expect_type(str)
+        age = convert(int) >> only_if(lambda v: v >= 0, 'age >= 0')
+        address = subrecord(Address)
+        vehicle = choose_by_field('kind', [Bicycle.get_factory(), Car.get_factory()])
+
+    good = {
+        'name': 'John',
+        'age': '10',
+        'address': {'city': 'X', 'zip': '1'},
+        'vehicle': {'kind': Kind.Car, 'doors': 2},
+    }
+    assert Person.collect(good) == Person(good)
+    assert Person.get_factory().collect(good) == Person(good)
+
+    bad = {
+        'age': -1,
+        'address': {'city': 1, 'zip': 'z'},
+        'vehicle': {'kind': Kind.Car, 'doors': '2'},
+    }
+    with pytest.raises(AggregateError) as err:
+        Person.collect(bad)
+    err = err.value
+    assert isinstance(err, RecordError)
+    assert not err.truncated
+    assert set(err.errors) == {'name', 'age', 'address', 'vehicle'}
+    assert isinstance(err.errors['name'], MissingFieldError)
+    assert isinstance(err.errors['address'], AggregateError)
+    assert set(err.errors['address'].errors) == {'city', 'zip'}
+    assert set(err.errors['vehicle'].errors) == {'doors'}
+    assert sorted(path for path, _ in err.gen_leaf_errors()) == [
+        ('address', 'city'), ('address', 'zip'), ('age',), ('name',),
+        ('vehicle', 'doors'),
+    ]
+
+    with pytest.raises(AggregateError) as err:
+        Person.collect({**good, 'vehicle': {'kind': 'boat'}})
+    variants = err.value.errors['vehicle']
+    assert set(variants.errors) == {'Bicycle', 'Car'}
+
+    with pytest.raises(AggregateError) as err:
+        Person.collect(bad, max_errors=2)
+    assert err.value.truncated
+    assert list(err.value.errors) == ['name', 'age']
+
+    with pytest.raises(AggregateError) as err:
+        Person.collect(bad, max_errors=5)
+    assert not err.value.truncated
+    assert len(list(err.value.gen_leaf_errors())) == 5
+
+    def check_positive(obj, name, value):
+        if value <= 0:
+            raise ValueError(value)
+
+    class Checked(Record):
+        value = convert(int) << field_invariant(check_positive)
+        other = convert(int) << field_invariant(check_positive)
+
+    with pytest.raises(AggregateError) as err:
+        Checked.collect({'value': 0, 'other': 0})
+    assert set(err.value.errors) == {'value', 'other'}
+    assert pickle.loads(pickle.dumps(err.value)).errors.keys() == {'value', 'other'}
+
+
+def test_serializer():
+    class Color(Tag):
+        Red = 'red'
+
+    class Point(Record):
+        x = convert(int)
+        y = expect_type(float)
+
+    class Shape(Record):
+        name = convert(str)
+        color = convert(Color)
+        origin = subrecord(Point)
+        filled = expect_type(bool)
+        data = anything
+        note = skip_missing
+
+    class Extended(ExtensibleRecord):
+        shape = subrecord(Shape)
+
+    shape = Shape(
+        name='a"b%s', color='red', origin={'x': '1', 'y': 2.5}, filled=True,
+        data=[1, 2]
+    )
+    expected = {
+        'name': 'a"b%s', 'color': 'red', 'origin': {'x': 1, 'y': 2.5},
+        'filled': True, 'data': [1, 2], 'note': None,
+    }
+    assert as_basic_type(shape) == expected
+    assert list(as_basic_type(shape)) == list(expected)
+    assert to_json(shape) == json.dumps(expected)
+    assert to_json(shape, binary=True) == json.dumps(expected).encode('ascii')
+
+    extended = Extended(shape=shape, other=Color.Red)
+    assert as_basic_type(extended) == {'shape': expected, 'other': 'red'}
+    assert to_json(extended) == json.dumps({'shape': expected, 'other': 'red'})
+
+    @as_basic_type.register(Color)
+    def color_as_basic_type(v):
+        return v.name
+
+    assert as_basic_type(shape)['color'] == 'Red'
+
+
+def test_hash_record():
+    class Point(Record):
+        x = convert(int)
+        y = convert(int)
+
+    class Other(Record):
+        y = convert(int)
+        x = convert(int)
+
+    a = Point(x=1, y=2)
+    b = Point(x='1', y='2')
+    assert a == b and hash(a) == hash(b)
+    assert a != Point(x=1, y=3)
+    assert Other(x=1, y=2) == a and hash(Other(x=1, y=2)) == hash(a)
+    assert len({a, b, Point(x=2, y=1)}) == 2
+    assert Tagged(label={'text': 'a'}, extra=1) != Tagged(label={'text': 'a'})
+    assert hash(Tagged(label={'text': 'a'}, x=1)) == hash(Tagged(label={'text': 'a'}, x=1))
+
+    factory = Point.get_factory()
+    interned = factory.interned(x=1, y=2)
+    assert factory.interned({'x': '1', 'y': '2'}) is interned
+    assert factory.interned(x=2, y=2) is not interned
+    del interned
+    assert len(factory._interned) == 0
+
+
+def test_replace_record():
+    calls = []
+
+    def check(obj, name, value):
+        calls.append(name)
+        if value < 0:
+            raise ValueError(value)
+
+    def normalize(obj, name, value):
+        calls.append(name)
+        return name, value.lower()
+
+    class Address(Record):
+        city = convert(str)
+
+    class State(Record):
+        count = convert(int) << field_invariant(check)
+        limit = convert(int) << field_invariant(check)
+        name = convert(str) << field_aggregate(normalize)
+        address = subrecord(Address)
+
+    state = State(count=1, limit=10, name='A', address={'city': 'x'})
+    del calls[:]
+
+    res = state.replace(count='2')
+    assert calls == ['count']
+    assert res == State(state, count=2)
+    assert res.address is state.address
+    assert state.count == 1
+
+    del calls[:]
+    res = res.replace(name='B', limit=5)
+    assert res.name == 'b' and res.limit == 5 and res.count == 2
+    assert sorted(calls) == ['limit', 'name']
+
+    pytest.raises(RecordError, state.replace, count='x')
+    pytest.raises(RecordError, state.replace, count=-1)
+    assert state.replace() is state
+
+    tagged = Tagged(label={'text': 'a'}, extra=1)
+    assert tagged.replace(extra=2, other=3) == Tagged(tagged, extra=2, other=3)
+
+    class Scaled(operation.Operation):
+        info = 'scaled by factor'
+
+        def prepare_field(self, field_name, values):
+            return values[field_name] * values['factor']
+
+    class Size(Record):
+        factor = convert(int)
+        size = Scaled()
+
+    size = Size(factor=2, size=3)
+    assert size.replace(size=4) == Size(size, size=4) == Size(factor=2, size=4)
+    assert size.replace(size=4).size == 8
+
+
+def test_lazy_record():
+    calls = []
+
+    def to_int(v):
+        calls.append(v)
+        return int(v)
+
+    def check_less(obj, name, value):
+        if value >= obj.limit:
+            raise ValueError(value)
+
+    class Feed(LazyRecord):
+        a = convert(to_int)
+        b = convert(to_int)
+        c = skip_missing >> convert(to_int)
+        value = convert(int) << field_invariant(check_less, forces=['limit'])
+        limit = convert(int)
+
+    assert Feed.get_forced_fields() == ('value', 'limit')
+
+    feed = Feed(a='1', b='x', value='1', limit='5')
+    assert calls == []
+    assert feed.a == 1 and feed.a == 1
+    assert calls == ['1']
+    assert feed.c is None
+    with pytest.raises(InvalidFieldError):
+        feed.b
+    with pytest.raises(AccessError):
+        feed.a = 2
+
+    pytest.raises(RecordError, Feed, a='1', b='2', value='5', limit='5')
+    pytest.raises(RecordError, Feed, a='1', b='2', value='5')
+
+    missing = Feed(value=1, limit=2)
+    with pytest.raises(MissingFieldError):
+        missing.a
+
+    feed = Feed(a='1', b='2', value='1', limit='5').validate_all()
+    assert as_basic_type(feed) == {'a': 1, 'b': 2, 'c': None, 'value': 1, 'limit': 5}
+    assert feed == Feed(a=1, b=2, value=1, limit=5)
+    assert copy.deepcopy(feed) == feed
+    pytest.raises(InvalidFieldError, Feed(a='1', b='x', value=1, limit=2).validate_all)
+
+
+def test_memoized():
+    calls = []
+
+    def parse(v):
+        calls.append(v)
+        return int(v)
+
+    conversion = memoized(convert(parse), maxsize=2)
+    assert conversion.info == convert(parse).info
+
+    class Item(Record):
+        a = conversion
+        b = conversion >> only_if(lambda v: v > 0, 'positive') | convert(lambda v: 0)
+
+    assert Item(a='1', b='1') == {'a': 1, 'b': 1}
+    assert calls == ['1']
+    assert Item(a='2', b='x').b == 0
+    assert Item(a='3', b='2').b == 2
+    assert calls == ['1', '2', 'x', '3']
+    info = conversion.cache_info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (2, 4, 1, 2)
+    pytest.raises(RecordError, Item, a='x')
+    assert conversion.prepare_field('a', {'a': 1}) == 1
+    assert calls[-1] == 1
+    assert conversion.cache_info().evictions == 2
+
+    conversion.cache_clear()
+    assert conversion.cache_info() == (0, 0, 0, 2, 0)
+
+    class Address(Record):
+        city = convert(str)
+
+    address = memoized(subrecord(Address))
+    first = address.prepare_field('x', {'x': {'city': 'a'}})
+    assert address.prepare_field('x', {'x': {'city': 'a'}}) is first
+    assert address.prepare_field('x', {'x': {'city': ['a']}}).city == "['a']"
+    assert isinstance(address.try_prepare_field('x', {'x': {}}).error, RecordError)
+    assert address.cache_info().currsize == 1
+
+    class Counter(Record):
+        n = expect_type(int)
+
+    counter = memoized(subrecord(Counter))
+    first = counter.prepare_field('x', {'x': {'n': 1}})
+    pytest.raises(RecordError, counter.prepare_field, 'x', {'x': {'n': 1.0}})
+    assert counter.prepare_field('x', {'x': {'n': True}}).n is True
+    assert counter.prepare_field('x', {'x': {'n': 1}}) is first
+    assert counter.cache_info().hits == 1
+
+    class InputSize(operation.Operation):
+        info = 'input size'
+
+        def prepare_field(self, field_name, values):
+            return len(values)
+
+    pytest.raises(TypeError, memoized, InputSize())
+
+
+def test_record_view():
+    calls = []
+
+    def to_int(v):
+        calls.append(v)
+        return int(v)
+
+    class Item(Record):
+        a = convert(to_int)
+        b = skip_missing >> convert(to_int)
+        label = subrecord(Label)
+
+    data = {'a': '1', 'label': {'text': 't'}, 'other': 1}
+    view = Item.view(data)
+    assert isinstance(view, RecordView)
+    assert calls == []
+    assert view.a == 1 and view['a'] == 1
+    assert calls == ['1', '1']
+    assert view.b is None
+    assert isinstance(view.label, Label)
+    assert list(view) == ['a', 'b', 'label'] and len(view) == 3
+    assert 'other' not in view
+    pytest.raises(AttributeError, getattr, view, 'other')
+    assert view == Item(data)
+    assert Item(data) == view
+    assert view == {'a': 1, 'b': None, 'label': {'text': 't', 'color': None}}
+    assert as_basic_type(view) == as_basic_type(Item(data))
+    assert view.to_record() == Item(data)
+
+    del calls[:]
+    cached = Item.view(data, cache=True)
+    assert cached.a == 1 and cached.a == 1
+    assert calls == ['1']
+
+    bad = Item.view({'a': 'x'})
+    pytest.raises(InvalidFieldError, getattr, bad, 'a')
+    pytest.raises(MissingFieldError, getattr, bad, 'label')
+
+    tagged = Tagged.view({'label': {'text': 't'}, 'other': 1})
+    assert tagged.other == 1 and len(tagged) == 2
+    assert tagged == Tagged(label={'text': 't'}, other=1)
+
+
+def test_from_jsonl(tmpdir):
+    class Item(Record):
+        id = convert(int)
+        name = expect_type(str)
+
+    lines = [json.dumps({'id': i, 'name': 'ы{}'.format(i)}) for i in range(100)]
+    lines[10] = ''
+    data = '\n'.join(lines).encode('utf-8')
+    factory = Item.get_factory()
+
+    path = tmpdir.join('items.jsonl')
+    path.write_binary(data)
+    for chunk_size in (1, 7, 1 << 20):
+        records = list(factory.from_jsonl(str(path), chunk_size=chunk_size))
+        assert records == [Item(json.loads(l)) for l in lines if l]
+
+    bad = list(lines)
+    bad[20] = '{"id": "x", "name": "y"}'
+    bad[30] = '{"id": 1,'
+    bad[40] = b'{"id": 1, "name": "\xff"}'.decode('latin-1')
+    data = '\n'.join(bad).encode('latin-1')
+    with pytest.raises(RecordError) as err:
+        list(factory.from_jsonl(io.BytesIO(data)))
+    assert err.value.args[0]['line'] == 21
+    assert isinstance(err.value.__cause__, RecordError)
+
+    errors = []
+    records = list(factory.from_jsonl(
+        io.BytesIO(data), chunk_size=64,
+        on_error=lambda line_number, line, err: errors.append(line_number)
+    ))
+    assert errors == [21, 31, 41] and len(records) == 96
+    assert len(list(factory.from_jsonl(io.BytesIO(data), on_error='skip'))) == 96
+    with pytest.raises(ErrorLimitError):
+        list(factory.from_jsonl(io.BytesIO(data), on_error='skip', max_errors=1))
+
+
+def test_adaptive_or():
+    class Kind(Tag):
+        A = 'a'
+        B = 'b'
+
+    class A(Record):
+        kind = should_be(Kind.A)
+        value = expect_type(int)
+
+    class B(Record):
+        kind = convert(Kind) >> should_be(Kind.B)
+        value = convert(int)
+
+    declared = (
+        expect_type(str) | expect_type(int) | subrecord(A) | subrecord(B)
+        | provide_missing('x') >> expect_type(str)
+    )
+    op = adaptive(declared, period=10)
+    assert op.info == declared.info
+    assert [alt.info for alt in op.order] == [
+        alt.info for alt in operation._gen_or_alternatives(declared)
+    ]
+    # type checks and records can't both pass
+    assert op._groups == ((0, 1, 2, 3), (4,))
+
+    class Data(Record):
+        value = op
+
+    class Reference(Record):
+        value = declared
+
+    for _ in range(20):
+        assert Data(value={'kind': 'b', 'value': '1'}).value == B(kind='b', value=1)
+    assert [op.order.index(alt) for alt in op._alternatives] == [1, 2, 3, 0, 4]
+
+    inputs = [
+        {'value': 'v'}, {'value': 1}, {},
+        {'value': {'kind': Kind.A, 'value': 1}},
+        {'value': {'kind': Kind.B, 'value': 1}},
+    ]
+    for values in inputs:
+        assert Data(values).value == Reference(values).value
+        for prepare in (compile_operation(op), op.prepare_field):
+            assert prepare('value', values) == compile_operation(declared)('value', values)
+
+    for values in ({'value': 1.5}, {'value': {'kind': 'b', 'value': 'x'}}):
+        errors = []
+        for prepare in (compile_operation(declared), compile_operation(op), op.prepare_field):
+            with pytest.raises(Exception) as err:
+                prepare('value', values)
+            errors.append(_get_error_chain(err.value))
+        assert errors[0] == errors[1] == errors[2]
+
+    # order-sensitive alternatives are not reordered
+    op = adaptive(convert(int) | expect_type(str), period=2)
+    assert op._groups == ((0,), (1,))
+    for _ in range(5):
+        assert op.prepare_field('v', {'v': '1'}) == 1
+    assert [alt.info for alt in op.order] == [
+        convert(int).info, expect_type(str).info
+    ]
+    # value is not None in both
+    assert adaptive(should_be(None) | should_be(True))._groups == ((0,), (1,))
+    assert adaptive(expect_type(bool) | expect_type(int))._groups == ((0,), (1,))
+    assert adaptive(expect_type(bool) | expect_type(str))._groups == ((0, 1),)
+
+    class Options(Record):
+        value = skip_missing >> convert(int)
+
+    # record w/o required fields is created from any false value
+    assert adaptive(expect_type(str) | subrecord(Options))._groups == ((0,), (1,))
+    assert adaptive(should_be('x') | subrecord(Options))._groups == ((0, 1),)
+    assert adaptive(expect_type(dict) | subrecord(A))._groups == ((0,), (1,))
@@ -0,0 +1,275 @@
+import asyncio
+
+import pytest
+
+from cor.adt.error import (
+    ErrorLimitError,
+    InvalidFieldError,
+    MissingFieldError,
+    RecordError,
+)
+from cor.adt.operation import (
+    adaptive,
+    AsyncConversion,
+    aprepare_field,
+    convert,
+    expect_type,
+    is_async_operation,
+    memoized,
+    skip_missing,
+)
+from cor.adt.record import (
+    ExtensibleRecord,
+    Factory,
+    Record,
+)
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class _StubServer:
+    '''Local line-based server replying with upper-cased request'''
+
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.request_count = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _handle(self, reader, writer):
+        request = (await reader.readline()).decode().strip()
+        self.request_count += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        reply = 'ERR' if request == 'bad' else request.upper()
+        writer.write((reply + '\n').encode())
+        await writer.drain()
+        writer.close()
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *args):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def lookup(self, value):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        writer.write((value + '\n').encode())
+        reply = (await reader.readline()).decode().strip()
+        writer.close()
+        if reply == 'ERR':
+            raise ValueError('Unknown name: {}'.format(value))
+        return reply
+
+
+def _get_user_type(server):
+    class User(Record):
+        id = expect_type(int)
+        name = AsyncConversion(server.lookup)
+        group = skip_missing >> AsyncConversion(server.lookup)
+
+    return User
+
+
+def test_async_operation():
+    async def double(v):
+        await asyncio.sleep(0)
+        return v * 2
+
+    op = AsyncConversion(double)
+    assert is_async_operation(op)
+    assert is_async_operation(skip_missing >> op)
+    assert is_async_operation(op | convert(int))
+    assert not is_async_operation(convert(int) | skip_missing)
+
+    assert _run(aprepare_field(op, 'x', {'x': 2})) == 4
+    assert _run(aprepare_field(convert(int) >> op, 'x', {'x': '3'})) == 6
+    assert _run(aprepare_field(skip_missing >> op, 'x', {})) is None
+    assert _run(aprepare_field(convert(int), 'x', {'x': '5'})) == 5
+
+    with pytest.raises(MissingFieldError):
+        _run(aprepare_field(op, 'x', {}))
+    with pytest.raises(InvalidFieldError):
+        _run(aprepare_field(op, 'x', {'x': None}))
+    with pytest.raises(InvalidFieldError):
+        op.prepare_field('x', {'x': 2})
+
+    async def fail(v):
+        raise ValueError(v)
+
+    either = AsyncConversion(fail) | AsyncConversion(double)
+    assert _run(aprepare_field(either, 'x', {'x': 1})) == 2
+
+    either = AsyncConversion(fail) | convert(int)
+    with pytest.raises(InvalidFieldError) as err:
+        _run(aprepare_field(either, 'x', {'x': 'a'}))
+    assert isinstance(err.value.__cause__, InvalidFieldError)
+
+
+def test_async_wrappers():
+    calls = []
+
+    async def double(v):
+        calls.append(v)
+        return v * 2
+
+    op = memoized(AsyncConversion(double))
+    assert is_async_operation(op)
+    assert not is_async_operation(memoized(convert(int)))
+    assert [_run(aprepare_field(op, 'x', {'x': 2})) for _ in range(2)] == [4, 4]
+    assert calls == [2]
+    assert op.cache_info().hits == 1
+    pytest.raises(InvalidFieldError, op.prepare_field, 'x', {'x': 2})
+    with pytest.raises(MissingFieldError):
+        _run(aprepare_field(op, 'x', {}))
+
+    op = adaptive(expect_type(str) | AsyncConversion(double))
+    assert is_async_operation(op)
+    assert not is_async_operation(adaptive(expect_type(str) | convert(int)))
+    assert _run(aprepare_field(op, 'x', {'x': 'a'})) == 'a'
+    assert _run(aprepare_field(op, 'x', {'x': 3})) == 6
+
+    class Item(Record):
+        value = op
+        size = memoized(skip_missing >> AsyncConversion(double))
+
+    item = _run(Factory(Item).acreate(value=1, size=5))
+    assert (item.value, item.size) == (2, 10)
+
+
+def test_acreate():
+    async def main():
+        async with _StubServer(delay=0.1) as server:
+            User = _get_user_type(server)
+            factory = Factory(User)
+            with pytest.raises(RecordError):
+                User(id=1, name='x')
+
+            user = await factory.acreate({'id': 1, 'name': 'bob'}, group='admin')
+            assert user == User._from_state((1, 'BOB', 'ADMIN'))
+            assert server.request_count == 2
+            # both lookups are done concurrently
+            assert server.max_in_flight == 2
+
+            user = await factory.acreate(id=2, name='alice')
+            assert (user.name, user.group) == ('ALICE', None)
+
+            with pytest.raises(RecordError) as err:
+                await factory.acreate(id='1', name='bob')
+            assert isinstance(err.value.__cause__, InvalidFieldError)
+            assert server.request_count == 3
+
+            with pytest.raises(RecordError) as err:
+                await factory.acreate(id=1, name='bad')
+            assert isinstance(err.value.__cause__, InvalidFieldError)
+            with pytest.raises(RecordError) as err:
+                await factory.acreate(id=1)
+            assert isinstance(err.value.__cause__.__cause__, MissingFieldError)
+
+            class Account(ExtensibleRecord):
+                owner = Factory(User)
+                balance = convert(float)
+
+            account = await Factory(Account).acreate(
+                owner={'id': 1, 'name': 'bob'}, balance='1.5', note='x'
+            )
+            assert account.owner.name == 'BOB'
+            assert account.balance == 1.5
+            assert account.note == 'x'
+
+            class Point(Record):
+                x = convert(int)
+
+            Point = Factory(Point)
+            assert not is_async_operation(Point)
+            assert (await Point.acreate(x='1')).x == 1
+
+    _run(main())
+
+
+def test_astream():
+    async def main():
+        async with _StubServer(delay=0.05) as server:
+            factory = Factory(_get_user_type(server))
+            names = ['n{}'.format(i) for i in range(20)]
+
+            async def gen_inputs():
+                for i, name in enumerate(names):
+                    yield {'id': i, 'name': name}
+
+            users = [u async for u in factory.astream(gen_inputs(), concurrency=10)]
+            assert [u.name for u in users] == [n.upper() for n in names]
+            # 20 inputs processed by up to 10 at once
+            assert 1 < server.max_in_flight <= 10
+
+            inputs = [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'bad'}, {'id': 3, 'name': 'c'}]
+            with pytest.raises(RecordError):
+                [u async for u in factory.astream(inputs)]
+
+            users = [u async for u in factory.astream(inputs, on_error='skip')]
+            assert [u.id for u in users] == [1, 3]
+
+            errors = []
+            users = [
+                u async for u in factory.astream(
+                    inputs, on_error=lambda *args: errors.append(args)
+                )
+            ]
+            assert [u.id for u in users] == [1, 3]
+            assert [(i, v) for i, v, _ in errors] == [(1, inputs[1])]
+
+            with pytest.raises(ErrorLimitError):
+                [u async for u in factory.astream(inputs * 2, on_error='skip', max_errors=1)]
+
+            with pytest.raises(ValueError):
+                factory.astream(inputs, on_error='unknown')
+
+    _run(main())
+
+
+def test_astream_close():
+    cancelled = []
+    closed = []
+
+    async def lookup(value):
+        if value == 'fast':
+            return value
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(value)
+            raise
+        return value
+
+    class User(Record):
+        name = AsyncConversion(lookup)
+
+    async def gen_inputs():
+        try:
+            yield {'name': 'fast'}
+            for i in range(10):
+                yield {'name': 'slow{}'.format(i)}
+        finally:
+            closed.append(True)
+
+    async def main():
+        stream = Factory(User).astream(gen_inputs(), concurrency=4)
+        assert (await stream.__anext__()).name == 'fast'
+        await stream.aclose()
+        # pending constructions are cancelled and awaited
+        assert sorted(cancelled) == ['slow0', 'slow1', 'slow2']
+        assert closed == [True]
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    _run(main())
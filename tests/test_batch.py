@@ -0,0 +1,107 @@
+import array
+
+import pytest
+
+from cor.adt.batch import RecordBatch
+from cor.adt.error import (
+    InvalidFieldError,
+    RecordError,
+)
+from cor.adt.hook import field_invariant
+from cor.adt.operation import (
+    as_basic_type,
+    convert,
+    expect_type,
+    skip_missing,
+)
+from cor.adt.record import (
+    ExtensibleRecord,
+    Record,
+    to_json,
+)
+
+
+class Point(Record):
+    x = expect_type(int)
+    y = convert(float)
+    name = skip_missing >> convert(str)
+
+
+def _gen_rows(count):
+    for i in range(count):
+        yield {'x': i, 'y': i / 2, 'name': 'p{}'.format(i)} if i % 2 else {'x': i, 'y': i}
+
+
+def test_record_batch():
+    batch = RecordBatch.from_rows(Point, _gen_rows(10))
+    assert len(batch) == 10
+    assert isinstance(batch.column('x'), array.array)
+    assert isinstance(batch.column('y'), array.array)
+    assert batch.column('name')[:4] == [None, 'p1', None, 'p3']
+
+    records = [Point(row) for row in _gen_rows(10)]
+    assert list(batch) == records
+    assert batch.to_records() == records
+    assert batch[-1] == records[-1]
+    assert batch[3].x == 3
+    assert batch[3].to_record() == records[3]
+    assert as_basic_type(batch[3]) == as_basic_type(records[3])
+    pytest.raises(IndexError, batch.__getitem__, 10)
+    pytest.raises(AttributeError, getattr, batch[0], 'z')
+
+    tail = batch[7:]
+    assert len(tail) == 3
+    assert list(tail) == records[7:]
+
+    batch2 = RecordBatch.from_records(Point, records)
+    assert list(batch2.iter_states()) == list(batch.iter_states())
+    assert len(RecordBatch.from_records(Point, [])) == 0
+
+    bools = RecordBatch.from_rows(Point, [{'x': True, 'y': 1}, {'x': 2, 'y': 1}])
+    assert isinstance(bools.column('x'), list)
+    assert bools[0].x is True
+
+
+def test_record_batch_errors():
+    rows = list(_gen_rows(5))
+    rows[3] = {'x': '3', 'y': 1}
+    with pytest.raises(RecordError) as err_info:
+        RecordBatch.from_rows(Point, rows)
+    assert err_info.value.args[0]['row'] == 3
+    assert isinstance(err_info.value.__cause__, InvalidFieldError)
+
+    def check_positive(_1, _2, value):
+        if value <= 0:
+            raise ValueError()
+
+    class Positive(Record):
+        x = expect_type(int) << field_invariant(check_positive)
+
+    assert [r.x for r in RecordBatch.from_rows(Positive, [{'x': 1}])] == [1]
+    with pytest.raises(RecordError) as err_info:
+        RecordBatch.from_rows(Positive, [{'x': 1}, {'x': 0}])
+    assert err_info.value.args[0] == {'name': 'Positive', 'info': 'post-init', 'row': 1}
+
+    class Extensible(ExtensibleRecord):
+        x = expect_type(int)
+
+    pytest.raises(TypeError, RecordBatch.from_rows, Extensible, [])
+    records = [Extensible(x=1, extra=2)]
+    pytest.raises(TypeError, RecordBatch.from_records, Extensible, records)
+
+
+def test_record_batch_numpy():
+    numpy = pytest.importorskip('numpy')
+    records = [Point(row) for row in _gen_rows(10)]
+    for batch in (
+            RecordBatch.from_rows(Point, _gen_rows(10), use_numpy=True),
+            RecordBatch.from_records(Point, records, use_numpy=True),
+    ):
+        assert isinstance(batch.column('x'), numpy.ndarray)
+        assert type(batch[3].x) is int
+        assert type(batch[3]['y']) is float
+        assert type(batch[3].to_record().x) is int
+        assert [type(v) for v in next(batch.iter_states())] == [int, float, type(None)]
+        assert batch.to_records() == records
+        assert all(type(r.y) is float for r in batch.to_records())
+        assert to_json(batch[1]) == to_json(records[1])
@@ -0,0 +1,147 @@
+import concurrent.futures
+import multiprocessing
+
+import pytest
+
+from cor.adt.codec import (
+    decode,
+    encode,
+    get_fingerprint,
+)
+from cor.adt.error import (
+    DecodeError,
+    RecordError,
+)
+from cor.adt.operation import (
+    anything,
+    convert,
+    expect_type,
+    only_if,
+    skip_missing,
+    Tag,
+)
+from cor.adt.record import (
+    as_basic_type,
+    ExtensibleRecord,
+    Record,
+    record_factory,
+    subrecord,
+    to_json,
+)
+
+
+class Color(Tag):
+    Red = 'red'
+    Green = 'green'
+
+
+class Point(Record):
+    x = convert(int)
+    y = expect_type(float)
+
+
+class Shape(ExtensibleRecord):
+    name = convert(str)
+    color = convert(Color)
+    origin = subrecord(Point)
+    size = convert(int) >> only_if(lambda v: v > 0, 'positive')
+    data = anything
+    note = skip_missing
+
+
+def _parse_count(value):
+    return int(value)
+
+
+class Box(Record):
+    count = convert(_parse_count)
+    shape = subrecord(Shape)
+
+
+def _create_box(count):
+    return Box(count=count, shape={
+        'name': 'box', 'color': 'red', 'origin': {'x': 1, 'y': 2.0}, 'size': 3
+    })
+
+
+def _encode_box(count):
+    return encode(_create_box(count))
+
+
+def _decode_box(data):
+    return as_basic_type(decode(data))
+
+
+def test_codec():
+    shape = Shape(
+        name='shape', color='green', origin={'x': -300, 'y': 0.5}, size=2 ** 70,
+        data=[None, True, b'\0', ('x', {'k': Point(x=1, y=1.0)})], extra='e'
+    )
+    data = encode(shape)
+    assert get_fingerprint(data) == Shape._schema_fingerprint
+    plain = Shape(shape, data=None)
+    assert len(encode(plain)) < len(to_json(plain)) / 2
+
+    res = decode(data, trusted=True)
+    assert res == shape
+    assert res.color is Color.Green
+    assert isinstance(res.origin, Point)
+    assert res.data == [None, True, b'\0', ('x', {'k': Point(x=1, y=1.0)})]
+
+    res = decode(data, Shape)
+    assert as_basic_type(res) == as_basic_type(shape)
+    assert isinstance(res.origin, Point)
+
+    pytest.raises(DecodeError, decode, data, Point)
+    pytest.raises(DecodeError, decode, data[:-1], Shape)
+    pytest.raises(DecodeError, decode, data + b'\0', Shape)
+    pytest.raises(DecodeError, decode, b'{}')
+    pytest.raises(TypeError, encode, Shape(shape, data={1, 2}))
+
+    # tuple key of the data dict is replaced by unhashable list
+    malformed = bytearray(encode(Shape(shape, data={(1,): 1})))
+    pos = malformed.index(b'\x09\x01\x08')
+    malformed[pos + 2] = 7
+    pytest.raises(DecodeError, decode, bytes(malformed), trusted=True)
+
+    with pytest.raises(TypeError) as err:
+        encode(Shape(shape, data=Color.Red))
+    assert 'Tag' in str(err.value)
+
+    invalid = Shape._from_state(('s', Color.Red, Point(x=1, y=1.0), 0, None, None))
+    assert decode(encode(invalid), trusted=True) == invalid
+    pytest.raises(RecordError, decode, encode(invalid))
+
+
+def _create_parent_type(nested_names, colors):
+    color_type = Tag('Color', colors)
+    nested = record_factory('Nested', **{name: convert(int) for name in nested_names})
+    return record_factory(
+        'Parent', nested=nested, color=convert(color_type)
+    ).record_type
+
+
+def test_codec_nested_schema():
+    colors = [('Red', 'red'), ('Green', 'green')]
+    parent_type = _create_parent_type(['a', 'b'], colors)
+    data = encode(parent_type(nested={'a': 1, 'b': 2}, color='red'))
+    assert _create_parent_type(['a', 'b'], colors)._schema_fingerprint == get_fingerprint(data)
+
+    for other_type in (
+            _create_parent_type(['b', 'a'], colors),
+            _create_parent_type(['a', 'b'], colors[::-1]),
+    ):
+        assert other_type._schema_fingerprint != get_fingerprint(data)
+        pytest.raises(DecodeError, decode, data, other_type, trusted=True)
+
+
+def test_codec_across_processes():
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context('spawn')
+    ) as executor:
+        data = executor.submit(_encode_box, 1).result()
+        assert get_fingerprint(data) == Box._schema_fingerprint
+        assert decode(data) == _create_box(1)
+
+        box = _create_box(2)
+        assert executor.submit(_decode_box, encode(box)).result() == as_basic_type(box)
@@ -0,0 +1,127 @@
+import itertools
+
+import pytest
+
+from cor.adt.error import RecordError
+from cor.adt.generate import (
+    generate_inputs,
+    InputGenerator,
+)
+from cor.adt.operation import (
+    adaptive,
+    choose_by_field,
+    convert,
+    expect_type,
+    expect_types,
+    only_if,
+    provide_missing,
+    should_be,
+    skip_missing,
+    Tag,
+)
+from cor.adt.record import (
+    Record,
+    subrecord,
+)
+
+
+class Kind(Tag):
+    Card = 'card'
+    Cash = 'cash'
+
+
+class Card(Record):
+    kind = convert(Kind) >> should_be(Kind.Card)
+    number = expect_type(str)
+
+
+class Cash(Record):
+    kind = should_be(Kind.Cash)
+    currency = skip_missing >> expect_type(str)
+
+
+class Address(Record):
+    city = expect_type(str)
+    zip = expect_types(str, int)
+
+
+class Order(Record):
+    id = expect_type(int)
+    amount = convert(float)
+    status = convert(Kind)
+    note = skip_missing >> expect_type(str)
+    priority = provide_missing(0) >> expect_type(int)
+    ref = expect_type(str) | expect_type(int)
+    payment = choose_by_field('kind', [Card.get_factory(), Cash.get_factory()])
+    address = subrecord(Address)
+    flag = adaptive(should_be(True) | should_be(False))
+
+
+def test_generate_inputs():
+    rows = list(generate_inputs(Order, 500, seed=1))
+    assert rows == list(generate_inputs(Order, 500, seed=1))
+    assert rows != list(generate_inputs(Order, 500, seed=2))
+
+    for row in rows:
+        Order(row)
+
+    assert {type(row['ref']) for row in rows} == {str, int}
+    assert {type(row['payment']['kind']) for row in rows} == {str, Kind}
+    assert 0 < sum('note' in row for row in rows) < len(rows)
+
+    rows = generate_inputs(Order, 100, seed=1, optional_ratio=0)
+    assert all('note' in row and 'priority' in row for row in rows)
+
+    def choose_last(alternatives, rng):
+        return len(alternatives) - 1
+
+    rows = generate_inputs(Order, 100, seed=1, choose=choose_last)
+    assert all(isinstance(Order(row).payment, Cash) for row in rows)
+
+
+def test_generate_invalid_inputs():
+    generator = InputGenerator(Order, seed=3, invalid_ratio=0.3)
+    labeled = list(itertools.islice(generator.gen_labeled(), 1000))
+    assert 200 < sum(not is_valid for _, is_valid in labeled) < 400
+    for row, is_valid in labeled:
+        if is_valid:
+            Order(row)
+        else:
+            with pytest.raises(RecordError):
+                Order(row)
+
+    assert len(generator.take(10)) == 10
+
+
+def test_generate_pipes():
+    class Measure(Record):
+        count = expect_type(int) >> only_if(lambda v: v > 0, 'positive')
+        limit = skip_missing >> convert(int) >> only_if(lambda v: v < 10, 'less than 10')
+        label = convert(str) >> expect_type(str)
+
+    generator = InputGenerator(Measure, seed=1, invalid_ratio=0.2)
+    labeled = generator.gen_labeled()
+    for row, is_valid in itertools.islice(labeled, 500):
+        if is_valid:
+            Measure(row)
+
+    rows = list(generate_inputs(Measure, 500, seed=1))
+    assert all(Measure(row).count > 0 for row in rows)
+    assert 0 < sum('limit' in row for row in rows) < len(rows)
+
+    class Mismatch(Record):
+        value = convert(str) >> expect_type(int)
+
+    with pytest.raises(TypeError):
+        InputGenerator(Mismatch)
+
+
+def test_generate_unsupported():
+    class Positive(Record):
+        value = only_if(lambda v: v > 0, 'positive')
+
+    with pytest.raises(TypeError):
+        InputGenerator(Positive)
+
+    rows = generate_inputs(Positive, 10, fields={'value': lambda: 1})
+    assert [Positive(row).value for row in rows] == [1] * 10
@@ -0,0 +1,114 @@
+import io
+import json
+import pathlib
+
+import pytest
+
+from cor.adt import instrument
+from cor.adt.error import RecordError
+from cor.adt.operation import (
+    convert,
+    expect_type,
+    skip_missing,
+)
+from cor.adt.record import (
+    Factory,
+    Record,
+    record_factory,
+)
+
+
+class Point(Record):
+    x = expect_type(int) | convert(int)
+    y = skip_missing >> convert(float)
+
+
+@pytest.fixture
+def instrumented():
+    instrument.enable()
+    try:
+        yield instrument
+    finally:
+        instrument.disable()
+
+
+def _get_stats(record, field, node):
+    res, = (
+        s for s in instrument.snapshot()
+        if (s.record, s.field, s.node) == (record, field, node)
+    )
+    return res
+
+
+def test_instrument(instrumented):
+    init = Point.__init__
+    assert instrument.is_enabled()
+    Point(x=1)
+    Point(x='2', y='1.5')
+    with pytest.raises(RecordError):
+        Point(x='a')
+
+    x = _get_stats('Point', 'x', 'root')
+    assert (x.operation, x.calls, x.failures, x.matches) == ('Or', 3, 1, (1, 1))
+    assert x.info == Point.get_contract()['x'].info
+    assert 0 < x.max_time <= x.total_time
+    assert _get_stats('Point', 'x', 'root.left').failures == 2
+    assert _get_stats('Point', 'x', 'root.right').calls == 2
+    assert _get_stats('Point', 'y', 'root.right').calls == 1
+
+    class Line(Record):
+        start = Factory(Point)
+        end = Factory(Point)
+
+    list(Line.get_factory().stream(
+        [{'start': {'x': 1}, 'end': {'x': 2}}, {'start': {}}], on_error='skip'
+    ))
+    assert _get_stats('test_instrument.<locals>.Line', 'start', 'root').calls == 2
+    assert _get_stats('test_instrument.<locals>.Line', 'end', 'root').calls == 1
+    assert _get_stats('Point', 'x', 'root').calls == 6
+
+    text = instrument.to_prometheus()
+    assert (
+        'cor_adt_operation_calls_total{record="Point",field="x",node="root",operation="Or"} 6'
+        in text
+    )
+    assert (
+        'cor_adt_operation_or_matches_total'
+        '{record="Point",field="x",node="root",operation="Or",side="left"} 3'
+        in text
+    )
+
+    out = io.StringIO()
+    instrument.dump_json(out)
+    data = json.loads(out.getvalue())
+    assert {'record': 'Point', 'field': 'x', 'node': 'root', 'calls': 6} in [
+        {k: item[k] for k in ('record', 'field', 'node', 'calls')} for item in data
+    ]
+
+    instrument.reset()
+    assert not instrument.snapshot()
+    assert instrument.snapshot(include_unused=True)
+
+    instrument.disable()
+    assert Point.__init__ is not init
+    Point(x=1)
+    assert not instrument.snapshot()
+    assert Point(x='1') == Point(x=1)
+
+
+def test_instrument_aggregate(instrumented, tmpdir):
+    for i in range(3):
+        create = record_factory('Item', value=convert(int))
+        create({'value': str(i)})
+
+    count = len(instrument.snapshot(include_unused=True))
+    record_factory('Item', value=convert(int))
+    assert len(instrument.snapshot(include_unused=True)) == count
+    assert _get_stats('Item', 'value', 'root').calls == 3
+
+    path = pathlib.Path(str(tmpdir.join('stats.json')))
+    instrument.dump_json(path)
+    data = json.loads(path.read_text())
+    assert {'record': 'Item', 'field': 'value', 'calls': 3} in [
+        {k: item[k] for k in ('record', 'field', 'calls')} for item in data
+    ]
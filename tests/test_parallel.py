@@ -0,0 +1,118 @@
+import multiprocessing
+import pickle
+
+import pytest
+
+from cor.adt.error import (
+    InvalidFieldError,
+    RecordError,
+)
+from cor.adt.operation import (
+    convert,
+    expect_type,
+)
+from cor.adt.parallel import build_parallel
+from cor.adt.record import (
+    find_record_type,
+    record_factory,
+)
+
+
+def _parse_length(value):
+    return abs(int(value))
+
+
+Segment = record_factory(
+    'Segment', start=expect_type(int), length=convert(_parse_length)
+)
+
+
+class _NoStr:
+    def __str__(self):
+        raise ValueError(lambda: None)
+
+
+def _get_factory():
+    return record_factory(
+        'Point',
+        x=expect_type(int),
+        label=record_factory('Label', text=convert(str)),
+    )
+
+
+def test_pickle_dynamic_record():
+    factory = _get_factory()
+    record_type = factory.record_type
+    assert find_record_type(record_type._schema_fingerprint) is record_type
+    pytest.raises(LookupError, find_record_type, 'unknown')
+
+    point = factory(x=1, label={'text': 2})
+    restored = pickle.loads(pickle.dumps(point))
+    assert type(restored) is record_type
+    assert restored == point
+    assert restored.label.text == '2'
+
+    same_schema_type = _get_factory().record_type
+    assert same_schema_type is not record_type
+    assert same_schema_type._schema_fingerprint == record_type._schema_fingerprint
+    assert find_record_type(record_type._schema_fingerprint) is same_schema_type
+
+    err = InvalidFieldError('x', 'input', value=1)
+    restored = pickle.loads(pickle.dumps(err))
+    assert type(restored) is InvalidFieldError
+    assert restored.args == err.args
+
+    with pytest.raises(RecordError) as err_info:
+        factory(x=1, label={'text': _NoStr()})
+    chain = _get_error_chain(pickle.loads(pickle.dumps(err_info.value)))
+    expected = _get_error_chain(err_info.value)
+    assert chain[:-1] == expected[:-1]
+    root = err_info.value
+    while root.__cause__ is not None:
+        root = root.__cause__
+    # unpicklable cause is replaced by its description
+    assert chain[-1] == (Exception, repr(root))
+
+
+def _get_error_chain(err):
+    res = []
+    while err is not None:
+        res.append((type(err), str(err)))
+        err = err.__cause__
+    return res
+
+
+def test_build_parallel():
+    factory = _get_factory()
+    rows = [
+        {'x': i, 'label': {'text': i}} if i % 7 else {'x': str(i)}
+        for i in range(100)
+    ]
+
+    res = build_parallel(factory, rows, on_error='collect', chunk_size=9, max_workers=2)
+    assert res.records == [
+        factory(row) for i, row in enumerate(rows) if i % 7
+    ]
+    assert [e.index for e in res.errors] == list(range(0, 100, 7))
+    _, local_errors = factory.build_many(rows, on_error='collect')
+    for e, (_, local_error) in zip(res.errors, local_errors):
+        assert isinstance(e.error.__cause__, InvalidFieldError)
+        assert e.error.__cause__.args[0]['name'] == 'x'
+        assert _get_error_chain(e.error) == _get_error_chain(local_error)
+
+    res = build_parallel(factory, rows, on_error='skip', chunk_size=9, max_workers=2)
+    assert len(res.records) == 85
+    assert res.errors == []
+
+    with pytest.raises(RecordError):
+        build_parallel(factory, rows, chunk_size=9, max_workers=2)
+
+
+def test_build_parallel_spawn():
+    rows = [{'start': i, 'length': str(-i)} for i in range(20)] + [{'start': 'x'}]
+    res = build_parallel(
+        Segment, rows, on_error='collect', chunk_size=6, max_workers=2,
+        mp_context=multiprocessing.get_context('spawn')
+    )
+    assert res.records == [Segment(row) for row in rows[:-1]]
+    assert [e.index for e in res.errors] == [20]
@@ -0,0 +1,99 @@
+import pytest
+
+from cor.adt.error import (
+    DecodeError,
+    RecordError,
+)
+from cor.adt.operation import (
+    anything,
+    convert,
+    expect_type,
+    skip_missing,
+    Tag,
+)
+from cor.adt.record import (
+    as_basic_type,
+    Record,
+    record_factory,
+)
+from cor.adt.store import RecordStore
+
+
+class Currency(Tag):
+    Usd = 'usd'
+    Eur = 'eur'
+
+
+class Rate(Record):
+    id = convert(int)
+    value = expect_type(float)
+    currency = convert(Currency)
+    active = skip_missing >> expect_type(bool)
+
+
+def test_record_store(tmpdir):
+    path = str(tmpdir.join('rates.bin'))
+    rates = [
+        Rate(id=i, value=i / 2, currency='eur' if i % 2 else 'usd', active=i % 3 == 0)
+        for i in range(100)
+    ]
+    rates[1] = Rate(id=1, value=0.5, currency='eur')
+
+    with RecordStore.create(Rate, path, capacity=8) as store:
+        store.extend(rates[:50])
+        for rate in rates[50:-1]:
+            store.append(rate)
+        store.append(as_basic_type(rates[-1]))
+        pytest.raises(RecordError, store.append, {'id': 'x'})
+        assert len(store) == 100
+
+    with RecordStore.open(Rate, path, readonly=True) as store:
+        assert len(store) == 100
+        row = store[1]
+        assert row.currency is Currency.Eur and row.active is None
+        assert row == rates[1]
+        assert store[-1].to_record() == rates[-1]
+        assert as_basic_type(store[3]) == as_basic_type(rates[3])
+        assert list(store.iter_records()) == rates
+        assert list(store.iter_states(98)) == [r.get_state() for r in rates[98:]]
+        with store.scan(0, 2) as head, store.scan() as rows:
+            assert head.readonly
+            assert head.nbytes * 50 == rows.nbytes
+            assert head == rows[:head.nbytes]
+
+    with RecordStore.open(Rate, path) as store:
+        store.append(rates[0])
+        assert len(store) == 101
+
+    class Other(Record):
+        id = convert(int)
+
+    pytest.raises(DecodeError, RecordStore.open, Other, path)
+
+    class Unsized(Record):
+        name = convert(str)
+        data = anything
+
+    pytest.raises(TypeError, RecordStore.create, Unsized, path)
+
+
+def _create_rate_type(currencies):
+    currency_type = Tag('Currency', currencies)
+    return record_factory(
+        'Rate', id=convert(int), currency=convert(currency_type)
+    ).record_type
+
+
+def test_record_store_schema(tmpdir):
+    path = str(tmpdir.join('rates.bin'))
+    currencies = [('Usd', 'usd'), ('Eur', 'eur')]
+    rate_type = _create_rate_type(currencies)
+    with RecordStore.create(rate_type, path) as store:
+        store.append(rate_type(id=1, currency='eur'))
+
+    with RecordStore.open(_create_rate_type(currencies), path) as store:
+        assert store[0].currency.value == 'eur'
+
+    # members are stored as indexes
+    reordered_type = _create_rate_type(currencies[::-1])
+    pytest.raises(DecodeError, RecordStore.open, reordered_type, path)